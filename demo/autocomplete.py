@@ -0,0 +1,144 @@
+# demo/autocomplete.py
+from bisect import bisect_left, insort
+
+from homepage.models import CatalogItem
+from homepage.search_keys import normalize
+
+from .catalog_index import CatalogIndex
+
+SUGGESTIONS_PER_TYPE = 5
+
+# Match tiers, best first: whole title starts with the query, a later title word does, the category label does
+TITLE_START, WORD_START, CATEGORY = range(3)
+
+
+def _terms(key, category_label):
+    # `key` is the stored search_key, already normalized at save()
+    words = key.split()
+    terms = []
+    if words:
+        terms.append((TITLE_START, ' '.join(words)))
+    for i in range(1, len(words)):
+        terms.append((WORD_START, ' '.join(words[i:])))
+    label = normalize(category_label)
+    if label:
+        terms.append((CATEGORY, label))
+    return terms
+
+
+def _entry(item):
+    return {
+        "title": item.title,
+        "price": str(item.price),
+        "image": item.image.url if item.image else "",
+        "url": item.get_absolute_url(),
+        "type": item.get_kind_display(),
+    }, _terms(item.search_key, item.category_label)
+
+
+class PrefixIndex(CatalogIndex):
+    """
+    Sorted-array prefix index over normalized CatalogItem titles and category labels.
+    Each (kind, tier) keeps a sorted list of (term, item_id); a prefix lookup is a
+    bisect plus a walk over the matching run, so no query ever reaches the database.
+    """
+
+    KINDS = (CatalogItem.BOOK, CatalogItem.PRODUCT)
+    STATE = ('entries', 'payloads', 'item_terms')
+
+    def _reset(self):
+        self.entries = {kind: [[] for _ in range(3)] for kind in self.KINDS}
+        self.payloads = {kind: {} for kind in self.KINDS}
+        self.item_terms = {kind: {} for kind in self.KINDS}
+
+    # ---------- building ----------
+
+    def _load(self):
+        fresh = type(self)()
+        items = CatalogItem.objects.only(
+            'kind', 'item_id', 'title', 'search_key', 'slug', 'category_label', 'price', 'image',
+        )
+        for item in items:
+            fresh._add(item.kind, item.item_id, *_entry(item), sort=False)
+        for tiers in fresh.entries.values():
+            for entries in tiers:
+                entries.sort()
+        return fresh
+
+    def _add(self, kind, item_id, payload, terms, sort=True):
+        self.payloads[kind][item_id] = payload
+        self.item_terms[kind][item_id] = terms
+        for tier, term in terms:
+            if sort:
+                insort(self.entries[kind][tier], (term, item_id))
+            else:
+                self.entries[kind][tier].append((term, item_id))
+
+    def _remove(self, kind, item_id):
+        self.payloads[kind].pop(item_id, None)
+        for tier, term in self.item_terms[kind].pop(item_id, []):
+            entries = self.entries[kind][tier]
+            i = bisect_left(entries, (term, item_id))
+            if i < len(entries) and entries[i] == (term, item_id):
+                del entries[i]
+
+    def _sync(self, kind, item_id, entry, version):
+        """
+        Apply one change made in this process. `version` is the catalog version the
+        change produced; if this index missed an earlier bump (a change made by
+        another process) it is left stale and the next lookup reloads it.
+        """
+        with self._lock:
+            if self.version is None or self.version != version - 1:
+                return
+            self._remove(kind, item_id)
+            if entry is not None:
+                self._add(kind, item_id, *entry)
+            self.version = version
+
+    def update(self, item, version):
+        self._sync(item.kind, item.item_id, _entry(item), version)
+
+    def remove(self, item, version):
+        self._sync(item.kind, item.item_id, None, version)
+
+    # ---------- querying ----------
+
+    def _lookup(self, kind, prefix, limit):
+        found = []
+        seen = set()
+        for entries in self.entries[kind]:
+            i = bisect_left(entries, (prefix,))
+            while i < len(entries) and len(found) < limit:
+                term, item_id = entries[i]
+                if not term.startswith(prefix):
+                    break
+                if item_id not in seen:
+                    seen.add(item_id)
+                    found.append(self.payloads[kind][item_id])
+                i += 1
+            if len(found) >= limit:
+                break
+        return found
+
+    def suggest(self, query, limit=SUGGESTIONS_PER_TYPE):
+        """Return up to `limit` books then `limit` products matching `query`, no duplicate titles"""
+        prefix = normalize(query)
+        if not prefix:
+            return []
+        self.ensure_current()
+
+        with self._lock:
+            candidates = self._lookup(CatalogItem.BOOK, prefix, limit) + self._lookup(CatalogItem.PRODUCT, prefix, limit)
+
+        results = []
+        seen_titles = set()
+        for payload in candidates:
+            title_lower = payload["title"].lower().strip()
+            if title_lower not in seen_titles:
+                seen_titles.add(title_lower)
+                results.append(payload)
+        return results
+
+
+autocomplete_index = PrefixIndex()
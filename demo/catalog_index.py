@@ -0,0 +1,77 @@
+# demo/catalog_index.py
+import logging
+import threading
+
+from django.db import close_old_connections
+
+from homepage.cache import get_catalog_version
+
+logger = logging.getLogger(__name__)
+
+
+class CatalogIndex:
+    """
+    Base of the in-process indexes loaded from CatalogItem (autocomplete, BM25).
+
+    Subclasses list their data attributes in STATE and implement _load(), which
+    returns a new instance filled from the database. A reload builds that
+    instance without holding _lock and swaps its STATE in at the end, so
+    lookups are never blocked by the queries.
+
+    The first lookup in a process loads synchronously; concurrent ones wait for
+    it. After that, a lookup that finds the index behind the catalog version
+    (changed by another process) keeps answering from the current data while a
+    single background thread reloads, like the shelf rebuild in homepage.shelves.
+    """
+
+    STATE = ()
+
+    def __init__(self):
+        self.version = None
+        self._lock = threading.RLock()
+        # Held by the one thread loading; released by the background thread when it is done
+        self._reload_lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        raise NotImplementedError
+
+    def _load(self):
+        raise NotImplementedError
+
+    def _reload(self):
+        version = get_catalog_version()
+        fresh = self._load()
+        with self._lock:
+            for name in self.STATE:
+                setattr(self, name, getattr(fresh, name))
+            self.version = version
+
+    def rebuild(self):
+        """Reload now, in this thread"""
+        with self._reload_lock:
+            self._reload()
+
+    def _reload_in_background(self):
+        try:
+            self._reload()
+        except Exception as e:
+            logger.error(f"{type(self).__name__} reload failed: {str(e)}", exc_info=True)
+        finally:
+            self._reload_lock.release()
+            close_old_connections()
+
+    def ensure_current(self):
+        """Make sure the index is loaded, and start a reload if it is stale"""
+        if self.version is None:
+            with self._reload_lock:
+                if self.version is None:
+                    self._reload()
+            return
+        if self.version == get_catalog_version():
+            return
+        if not self._reload_lock.acquire(blocking=False):
+            return  # another thread is already reloading
+        threading.Thread(
+            target=self._reload_in_background, name=f'{type(self).__name__}-reload', daemon=True,
+        ).start()
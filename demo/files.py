@@ -0,0 +1,182 @@
+# demo/files.py
+import mimetypes
+import os
+import re
+import stat
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, Http404, HttpResponse
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, parse_http_date_safe
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+class FileSlice:
+    """Read-only view of bytes [start, start + length) of an open file, for bounded ranges"""
+
+    def __init__(self, f, start, length):
+        self.f = f
+        self.remaining = length
+        f.seek(start)
+
+    def read(self, size=-1):
+        if self.remaining <= 0:
+            return b''
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.f.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def close(self):
+        self.f.close()
+
+
+def _file_etag(st):
+    return f'"{st.st_mtime_ns:x}-{st.st_size:x}"'
+
+
+def parse_range(header, size):
+    """
+    Return (start, end) inclusive for a single-range `Range` header, None when
+    the header should be ignored (absent, malformed or multi-range, which is
+    answered with the whole file), or False when it cannot be satisfied.
+    """
+    match = RANGE_RE.match(header.replace(' ', '')) if header else None
+    if not match or match.group(1) == match.group(2) == '':
+        return None
+    first, last = match.groups()
+    if first == '':
+        # Suffix range: the last N bytes
+        length = int(last)
+        if length == 0:
+            return False
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or end < start:
+        return False
+    return start, end
+
+
+def _if_range_matches(request, etag, mtime):
+    """A Range is honoured only if If-Range (when sent) still names this version of the file"""
+    if_range = request.META.get('HTTP_IF_RANGE')
+    if not if_range:
+        return True
+    if if_range.startswith(('"', 'W/')):
+        return if_range == etag
+    return parse_http_date_safe(if_range) == mtime
+
+
+def _accepted_encodings(header):
+    """Content codings an Accept-Encoding header allows (q > 0)"""
+    accepted = set()
+    for part in header.split(','):
+        coding, _, params = part.strip().partition(';')
+        q = params.strip().removeprefix('q=')
+        try:
+            if params and float(q) <= 0:
+                continue
+        except ValueError:
+            continue
+        accepted.add(coding.strip().lower())
+    return accepted
+
+
+def precompressed_path(request, root, path):
+    """
+    `path` with the .br or .gz suffix of a precompressed sibling the client
+    accepts (brotli first), or `path` itself if there is none.
+    """
+    accepted = _accepted_encodings(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+    for coding, suffix in (('br', '.br'), ('gzip', '.gz')):
+        if coding in accepted or '*' in accepted:
+            try:
+                if os.path.isfile(safe_join(root, path + suffix)):
+                    return path + suffix
+            except SuspiciousFileOperation:
+                break
+    return path
+
+
+def serve_file(request, root, path, max_age=0, offload=True):
+    """
+    Serve `path` below `root` with ETag/Last-Modified validation and single
+    byte ranges. When settings.SENDFILE_BACKEND is set (and `offload`), the body is
+    left to the front proxy via X-Accel-Redirect or X-Sendfile; otherwise a
+    FileResponse is returned, which WSGI servers send with sendfile().
+    """
+    try:
+        full_path = safe_join(root, path)
+        st = os.stat(full_path)
+    except (SuspiciousFileOperation, OSError, ValueError):
+        raise Http404("File not found")
+    if not stat.S_ISREG(st.st_mode):
+        raise Http404("File not found")
+
+    etag = _file_etag(st)
+    mtime = int(st.st_mtime)
+    content_type, encoding = mimetypes.guess_type(full_path)
+    content_type = content_type or 'application/octet-stream'
+
+    def finish(response):
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(mtime)
+        response['Accept-Ranges'] = 'bytes'
+        if encoding and response.status_code in (200, 206):
+            response['Content-Encoding'] = encoding
+        if max_age:
+            patch_cache_control(response, public=True, max_age=max_age)
+        return response
+
+    not_modified = get_conditional_response(request, etag=etag, last_modified=mtime)
+    if not_modified is not None:
+        return finish(not_modified)
+
+    backend = getattr(settings, 'SENDFILE_BACKEND', '') if offload else ''
+    if backend == 'x-accel-redirect':
+        # nginx handles ranges and the transfer; see SENDFILE_ACCEL_ROOT
+        response = HttpResponse(content_type=content_type)
+        relative = os.path.relpath(full_path, settings.SENDFILE_ACCEL_ROOT)
+        response['X-Accel-Redirect'] = settings.SENDFILE_ACCEL_PREFIX.rstrip('/') + '/' + quote(relative.replace(os.sep, '/'))
+        return finish(response)
+    if backend == 'x-sendfile':
+        response = HttpResponse(content_type=content_type)
+        response['X-Sendfile'] = full_path
+        return finish(response)
+
+    byte_range = None
+    if _if_range_matches(request, etag, mtime):
+        byte_range = parse_range(request.META.get('HTTP_RANGE', ''), st.st_size)
+    if byte_range is False:
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{st.st_size}'
+        return finish(response)
+
+    if request.method == 'HEAD':
+        response = HttpResponse(content_type=content_type)
+        response['Content-Length'] = st.st_size
+        return finish(response)
+
+    f = open(full_path, 'rb')
+    if byte_range is None:
+        response = FileResponse(f, content_type=content_type)
+    else:
+        start, end = byte_range
+        if end == st.st_size - 1:
+            # Open-ended range: a seeked file keeps sendfile() usable
+            f.seek(start)
+            response = FileResponse(f, content_type=content_type)
+        else:
+            response = FileResponse(FileSlice(f, start, end - start + 1), content_type=content_type)
+        response.status_code = 206
+        response['Content-Length'] = end - start + 1
+        response['Content-Range'] = f'bytes {start}-{end}/{st.st_size}'
+    response.block_size = STREAM_CHUNK_SIZE
+    return finish(response)
@@ -1,6 +1,8 @@
 # demo/middleware.py
 import time
+from django.conf import settings
 from django.http import HttpRequest
+from django.utils.cache import has_vary_header, patch_cache_control, patch_vary_headers
 
 class SecurityHeadersMiddleware:
     def __init__(self, get_response):
@@ -18,24 +20,51 @@ class SecurityHeadersMiddleware:
         return response
 
 class CacheControlMiddleware:
+    """
+    Set Cache-Control from settings.CACHE_POLICIES, picked by the URL name of the
+    matched view in settings.CACHE_POLICY_ROUTES; unlisted routes are left alone.
+
+    Public policies rely on the pages being identical for every visitor: the
+    cart count and the CSRF cookie come from the /cart/items/ fetch made by
+    cart.js, so the HTML varies only by Accept-Encoding, never by Cookie. A
+    response that does depend on the visitor anyway (it sets a cookie or was
+    marked Vary: Cookie by the session/CSRF machinery) is sent private instead.
+    Headers a view sets itself take precedence over public policies.
+    """
+    SHAREABLE_STATUSES = (200, 203, 204, 300, 301, 304, 404, 410)
+
     def __init__(self, get_response):
         self.get_response = get_response
-    
+
     def __call__(self, request: HttpRequest):
         response = self.get_response(request)
-        
-        # Never cache payment/checkout pages
-        if request.path.startswith(('/payment/', '/checkout/', '/api/initiate-payment')):
-            response['Cache-Control'] = 'no-store, no-cache, must-revalidate, max-age=0'
+
+        match = request.resolver_match
+        policy_name = settings.CACHE_POLICY_ROUTES.get(match.view_name) if match else None
+        if policy_name is None:
+            return response
+        policy = settings.CACHE_POLICIES[policy_name]
+
+        if not policy.get('public'):
+            # Cart, checkout and payment: always overrides whatever the view sent
+            patch_cache_control(response, **policy)
+            # For HTTP/1.0 caches and proxies that ignore Cache-Control
             response['Pragma'] = 'no-cache'
             response['Expires'] = '0'
-        
+            return response
+        if response.has_header('Cache-Control'):
+            return response
+        if self._shareable(request, response):
+            patch_cache_control(response, **policy)
+            patch_vary_headers(response, ['Accept-Encoding'])
+        else:
+            patch_cache_control(response, private=True, no_cache=True)
         return response
 
-# Add to settings.py MIDDLEWARE
-MIDDLEWARE = [
-    'django.middleware.security.SecurityMiddleware',
-    'demo.middleware.SecurityHeadersMiddleware',  # Add this
-    'demo.middleware.CacheControlMiddleware',      # Add this
-    # ... existing middleware
-]
\ No newline at end of file
+    def _shareable(self, request, response):
+        return (
+            request.method in ('GET', 'HEAD')
+            and response.status_code in self.SHAREABLE_STATUSES
+            and not response.cookies
+            and not has_vary_header(response, 'Cookie')
+        )
@@ -0,0 +1,188 @@
+# demo/minify.py
+"""
+Conservative CSS/JS minifiers for the collectstatic pipeline (demo.storage).
+
+Both remove comments and redundant whitespace while copying strings, template
+literals and regular expressions verbatim. The JS minifier keeps line breaks
+so automatic semicolon insertion behaves exactly as in the source.
+"""
+
+# A '/' after one of these (or at the start) begins a regex literal, otherwise it is division
+REGEX_PRECEDERS = set('(,=:[!&|?{};+-*%<>~^')
+REGEX_KEYWORDS = {
+    'return', 'typeof', 'case', 'do', 'else', 'in', 'of', 'new', 'delete',
+    'void', 'throw', 'instanceof', 'yield', 'await',
+}
+CSS_TIGHT = set('{};,')
+
+
+def _read_quoted(text, i, quote):
+    """Index just past the string starting at text[i] == quote"""
+    i += 1
+    while i < len(text):
+        if text[i] == '\\':
+            i += 2
+            continue
+        if text[i] == quote or text[i] == '\n' and quote != '`':
+            return i + 1
+        i += 1
+    return i
+
+
+def _read_regex(text, i):
+    """Index just past the regex literal (and its flags) starting at text[i] == '/'"""
+    i += 1
+    in_class = False
+    while i < len(text) and text[i] != '\n':
+        char = text[i]
+        if char == '\\':
+            i += 2
+            continue
+        if char == '[':
+            in_class = True
+        elif char == ']':
+            in_class = False
+        elif char == '/' and not in_class:
+            i += 1
+            break
+        i += 1
+    while i < len(text) and (text[i].isalnum() or text[i] == '_'):
+        i += 1
+    return i
+
+
+def _previous_token(out):
+    """Last significant character emitted, or the last word if it ends in a letter"""
+    j = len(out) - 1
+    while j >= 0 and out[j] in ' \n':
+        j -= 1
+    if j < 0:
+        return ''
+    if not (out[j].isalnum() or out[j] in '_$'):
+        return out[j]
+    end = j + 1
+    while j >= 0 and (out[j].isalnum() or out[j] in '_$'):
+        j -= 1
+    return ''.join(out[j + 1:end])
+
+
+def minify_js(text):
+    out = []
+    # Stack of open `${` substitutions inside template literals: brace depth of each
+    substitutions = []
+    i = 0
+    n = len(text)
+
+    def space():
+        if out and out[-1] not in ' \n':
+            out.append(' ')
+
+    def newline():
+        while out and out[-1] == ' ':
+            out.pop()
+        if out and out[-1] != '\n':
+            out.append('\n')
+
+    def template(i):
+        """Copy template-literal text from text[i] up to its end or the next `${`"""
+        start = i
+        while i < n:
+            if text[i] == '\\':
+                i += 2
+                continue
+            if text[i] == '`':
+                out.append(text[start:i + 1])
+                return i + 1
+            if text.startswith('${', i):
+                out.append(text[start:i + 2])
+                substitutions.append(0)
+                return i + 2
+            i += 1
+        out.append(text[start:])
+        return n
+
+    while i < n:
+        char = text[i]
+        if char in ' \t\r':
+            if out and out[-1] != '\n':
+                space()
+            i += 1
+        elif char == '\n':
+            newline()
+            i += 1
+        elif text.startswith('//', i):
+            i = text.find('\n', i)
+            i = n if i == -1 else i
+        elif text.startswith('/*', i):
+            end = text.find('*/', i + 2)
+            end = n if end == -1 else end + 2
+            if '\n' in text[i:end]:
+                newline()
+            else:
+                space()
+            i = end
+        elif char in '\'"':
+            end = _read_quoted(text, i, char)
+            out.append(text[i:end])
+            i = end
+        elif char == '`':
+            out.append('`')
+            i = template(i + 1)
+        elif char == '{' and substitutions:
+            substitutions[-1] += 1
+            out.append(char)
+            i += 1
+        elif char == '}' and substitutions:
+            if substitutions[-1] == 0:
+                # End of a `${...}`: back inside the template literal
+                substitutions.pop()
+                out.append('}')
+                i = template(i + 1)
+            else:
+                substitutions[-1] -= 1
+                out.append(char)
+                i += 1
+        elif char == '/':
+            previous = _previous_token(out)
+            if previous == '' or previous in REGEX_PRECEDERS or previous in REGEX_KEYWORDS:
+                end = _read_regex(text, i)
+                out.append(text[i:end])
+                i = end
+            else:
+                out.append(char)
+                i += 1
+        else:
+            out.append(char)
+            i += 1
+    return ''.join(out).strip() + '\n'
+
+
+def minify_css(text):
+    out = []
+    i = 0
+    n = len(text)
+    while i < n:
+        char = text[i]
+        if text.startswith('/*', i):
+            end = text.find('*/', i + 2)
+            i = n if end == -1 else end + 2
+        elif char in '\'"':
+            end = _read_quoted(text, i, char)
+            out.append(text[i:end])
+            i = end
+        elif char.isspace():
+            while i < n and text[i].isspace():
+                i += 1
+            if out and out[-1] not in CSS_TIGHT and out[-1] != ' ' and i < n and text[i] not in CSS_TIGHT:
+                out.append(' ')
+        elif char in CSS_TIGHT:
+            while out and out[-1] == ' ':
+                out.pop()
+            if char == '}' and out and out[-1] == ';':
+                out.pop()
+            out.append(char)
+            i += 1
+        else:
+            out.append(char)
+            i += 1
+    return ''.join(out).strip() + '\n'
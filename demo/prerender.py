@@ -0,0 +1,99 @@
+# demo/prerender.py
+"""
+Content pages rendered to files by `manage.py prerender_pages` (run at deploy,
+after collectstatic) and served by @serve_prerendered without touching the
+template engine. Pages that were never rendered fall back to their view.
+
+The files live in PRERENDER_ROOT on local disk, so they are per host. Category
+edits re-render productcatagory (refresh_prerendered, after the commit) on the
+host that made the edit only; other hosts keep serving their copy until their
+next prerender_pages run. With several hosts, put PRERENDER_ROOT on shared
+storage or run `prerender_pages productcatagory` on each host after edits.
+"""
+import gzip
+import logging
+import os
+from functools import wraps
+from pathlib import Path
+
+import brotli
+from django.conf import settings
+from django.test import RequestFactory
+from django.urls import resolve, reverse
+from django.utils.cache import patch_vary_headers
+
+from .files import precompressed_path, serve_file
+
+logger = logging.getLogger(__name__)
+
+# URL names of the pages whose output changes only on deploy (or, for productcatagory, on a category edit)
+PRERENDERED_PAGES = ('aboutus', 'contactinformation', 'return_policy', 'privacy_policy', 'productcatagory')
+
+
+def page_path(name):
+    return Path(settings.PRERENDER_ROOT) / f'{name}.html'
+
+
+def _write(path, data):
+    tmp = path.with_name(path.name + '.tmp')
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+def prerender_page(name):
+    """
+    Render the page named `name` through its view as an anonymous GET and
+    write it with .gz and .br siblings. Returns the uncompressed size.
+    """
+    url = reverse(name)
+    request = RequestFactory().get(url)
+    request.prerendering = True
+    match = resolve(url)
+    response = match.func(request, *match.args, **match.kwargs)
+    if response.status_code != 200:
+        raise ValueError(f"{url} answered {response.status_code}")
+
+    html = response.content
+    path = page_path(name)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Compressed copies first: the plain file's presence is what switches serving on
+    _write(path.with_name(path.name + '.gz'), gzip.compress(html, compresslevel=9, mtime=0))
+    _write(path.with_name(path.name + '.br'), brotli.compress(html, quality=11))
+    _write(path, html)
+    return len(html)
+
+
+def refresh_prerendered(*names):
+    """
+    Re-render pages that have been prerendered before, e.g. after a category
+    edit. Writes to this host's PRERENDER_ROOT only; call it from
+    transaction.on_commit so the page never shows uncommitted rows.
+    """
+    for name in names:
+        if not page_path(name).exists():
+            continue
+        try:
+            prerender_page(name)
+        except Exception as e:
+            logger.error(f"Could not re-render {name}: {str(e)}", exc_info=True)
+
+
+def serve_prerendered(name):
+    """View decorator: answer GETs from the prerendered file of `name`, with ETag/304 and gzip/brotli"""
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if (
+                request.method not in ('GET', 'HEAD')
+                or getattr(request, 'prerendering', False)
+                or not page_path(name).exists()
+            ):
+                return view(request, *args, **kwargs)
+            root = settings.PRERENDER_ROOT
+            response = serve_file(request, root, precompressed_path(request, root, page_path(name).name))
+            if response.get('Content-Type') == 'text/html':
+                response['Content-Type'] = 'text/html; charset=utf-8'
+            patch_vary_headers(response, ['Accept-Encoding'])
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,23 @@
+# demo/search/__init__.py
+from django.conf import settings
+from django.db import connection
+from django.utils.module_loading import import_string
+
+POSTGRES_BACKEND = 'demo.search.postgres.PostgresSearchBackend'
+BM25_BACKEND = 'demo.search.bm25.BM25SearchBackend'
+
+_backend = None
+
+
+def get_backend():
+    """
+    Return the configured search backend (settings.SEARCH_BACKEND), defaulting
+    to PostgreSQL full-text search on PostgreSQL and the in-process BM25 index elsewhere.
+    """
+    global _backend
+    if _backend is None:
+        path = getattr(settings, 'SEARCH_BACKEND', '') or (
+            POSTGRES_BACKEND if connection.vendor == 'postgresql' else BM25_BACKEND
+        )
+        _backend = import_string(path)()
+    return _backend
@@ -0,0 +1,58 @@
+# demo/search/base.py
+from homepage.models import CatalogItem
+from homepage.pagination import dump_cursor, load_cursor
+
+from ..autocomplete import autocomplete_index
+
+RESULTS_PER_PAGE = 20
+
+# Result kinds in result order when scores tie
+BOOK, PRODUCT = CatalogItem.BOOK, CatalogItem.PRODUCT
+
+
+def parse_cursor(cursor):
+    """Decode a search cursor into its (score, kind, id) sort key, or None for the first page"""
+    if not cursor:
+        return None
+    key = load_cursor(cursor)
+    if len(key) != 3 or not all(isinstance(value, (int, float)) for value in key):
+        raise ValueError("Invalid cursor")
+    return key
+
+
+def make_cursor(score, kind, item_id):
+    return dump_cursor([score, kind, item_id])
+
+
+class BaseSearchBackend:
+    """
+    Interface used by demo.views.search / search_suggestions.
+
+    Results are ordered by descending score, then kind (books first), then id;
+    cursors carry that (score, kind, id) key so every backend pages the same way.
+    """
+
+    def search_page(self, query, cursor=None, page_size=RESULTS_PER_PAGE):
+        """Return (results, next_cursor); results are CatalogItem rows with a `score`"""
+        raise NotImplementedError
+
+    def suggest(self, query):
+        """Autocomplete payloads for the search dropdown"""
+        return autocomplete_index.suggest(query)
+
+    def index(self, item, version):
+        """The CatalogItem of a saved Book or Product; `version` is the catalog version the save produced"""
+
+    def remove(self, item, version):
+        """A Book or Product was deleted; `item` carries its kind and item_id"""
+
+    def index_many(self, items):
+        """
+        A queryset of CatalogItems changed in bulk (an import, a product_variety
+        rename). Backends kept in process memory need nothing here: the caller
+        bumps the catalog version and they rebuild on their next query.
+        """
+
+    def rebuild(self):
+        """Re-index the whole catalog; returns the number of items indexed"""
+        return 0
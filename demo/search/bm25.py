@@ -0,0 +1,207 @@
+# demo/search/bm25.py
+import heapq
+import math
+from array import array
+from collections import Counter, defaultdict
+
+from django.db.models import Q
+
+from homepage.models import CatalogItem
+from homepage.search_keys import normalize
+
+from ..catalog_index import CatalogIndex
+from .base import RESULTS_PER_PAGE, BaseSearchBackend, make_cursor, parse_cursor
+
+K1 = 1.2
+B = 0.75
+# Title words count this many times more than category-label words
+TITLE_WEIGHT = 2.0
+# Compact postings once this share of indexed documents has been deleted
+COMPACT_RATIO = 0.25
+
+
+def _weighted_terms(item):
+    # search_key is stored already normalized (see Book.save / Product.save)
+    terms = Counter()
+    for word in item.search_key.split():
+        terms[word] += TITLE_WEIGHT
+    for word in normalize(item.category_label).split():
+        terms[word] += 1.0
+    return terms
+
+
+class BM25Index(CatalogIndex):
+    """
+    In-process BM25 inverted index over Book and Product titles and category labels.
+
+    Documents are numbered in insertion order; each term maps to two parallel
+    arrays (document numbers, weighted term frequencies). Deletes leave a
+    tombstone and the arrays are compacted once enough of them pile up.
+    """
+
+    STATE = ('doc_keys', 'doc_lengths', 'doc_terms', 'doc_numbers', 'postings', 'df', 'total_length', 'deleted')
+
+    def _reset(self):
+        self.doc_keys = []             # doc number -> (kind, id), None once deleted
+        self.doc_lengths = array('f')  # doc number -> weighted length
+        self.doc_terms = []            # doc number -> terms, for exact df bookkeeping
+        self.doc_numbers = {}          # (kind, id) -> doc number
+        self.postings = {}             # term -> (array('I') doc numbers, array('f') tf)
+        self.df = Counter()
+        self.total_length = 0.0
+        self.deleted = 0
+
+    # ---------- building ----------
+
+    def _load(self):
+        fresh = type(self)()
+        for item in CatalogItem.objects.only('kind', 'item_id', 'search_key', 'category_label'):
+            fresh._add((item.kind, item.item_id), _weighted_terms(item))
+        return fresh
+
+    def rebuild(self):
+        super().rebuild()
+        return len(self.doc_numbers)
+
+    def _add(self, key, terms):
+        number = len(self.doc_keys)
+        self.doc_keys.append(key)
+        self.doc_numbers[key] = number
+        self.doc_terms.append(tuple(terms))
+        length = sum(terms.values())
+        self.doc_lengths.append(length)
+        self.total_length += length
+        for term, tf in terms.items():
+            if term not in self.postings:
+                self.postings[term] = (array('I'), array('f'))
+            docs, tfs = self.postings[term]
+            docs.append(number)
+            tfs.append(tf)
+            self.df[term] += 1
+
+    def _remove(self, key):
+        number = self.doc_numbers.pop(key, None)
+        if number is None:
+            return
+        self.doc_keys[number] = None
+        self.total_length -= self.doc_lengths[number]
+        for term in self.doc_terms[number]:
+            self.df[term] -= 1
+            if not self.df[term]:
+                del self.df[term]
+        self.doc_terms[number] = ()
+        self.deleted += 1
+
+    def _compact(self):
+        live = [
+            (key, number) for number, key in enumerate(self.doc_keys) if key is not None
+        ]
+        old_postings = self.postings
+        old_lengths = self.doc_lengths
+        old_terms = self.doc_terms
+        renumber = {number: new for new, (_, number) in enumerate(live)}
+
+        self.doc_keys = [key for key, _ in live]
+        self.doc_numbers = {key: new for new, (key, _) in enumerate(live)}
+        self.doc_lengths = array('f', (old_lengths[number] for _, number in live))
+        self.doc_terms = [old_terms[number] for _, number in live]
+        self.postings = {}
+        for term, (docs, tfs) in old_postings.items():
+            kept = [(renumber[d], tf) for d, tf in zip(docs, tfs) if d in renumber]
+            if kept:
+                self.postings[term] = (array('I', (d for d, _ in kept)), array('f', (tf for _, tf in kept)))
+        self.deleted = 0
+
+    def sync(self, key, terms, version):
+        """
+        Apply one change made in this process. `version` is the catalog version the
+        change produced; if this index missed an earlier bump (a change made by
+        another process) it is left stale and the next search reloads it.
+        """
+        with self._lock:
+            if self.version is None or self.version != version - 1:
+                return
+            self._remove(key)
+            if terms is not None:
+                self._add(key, terms)
+            if self.deleted > COMPACT_RATIO * len(self.doc_keys):
+                self._compact()
+            self.version = version
+
+    # ---------- querying ----------
+
+    def scores(self, query):
+        """Return {(kind, id): BM25 score} for every document matching any query word"""
+        self.ensure_current()
+
+        with self._lock:
+            live = len(self.doc_numbers)
+            if not live:
+                return {}
+            avg_length = self.total_length / live
+            scores = Counter()
+            for term in set(normalize(query).split()):
+                postings = self.postings.get(term)
+                df = self.df.get(term, 0)
+                if postings is None or not df:
+                    continue
+                idf = math.log(1 + (live - df + 0.5) / (df + 0.5))
+                docs, tfs = postings
+                for number, tf in zip(docs, tfs):
+                    key = self.doc_keys[number]
+                    if key is None:
+                        continue
+                    norm = K1 * (1 - B + B * self.doc_lengths[number] / avg_length)
+                    scores[key] += idf * tf * (K1 + 1) / (tf + norm)
+            return scores
+
+
+class BM25SearchBackend(BaseSearchBackend):
+    """
+    Relevance-ranked search with no database work beyond loading the rows shown.
+    Used on SQLite and other non-PostgreSQL deployments. The index is loaded from
+    CatalogItem on the first search in each process and kept current by the
+    model signals.
+    """
+
+    def __init__(self):
+        self.bm25 = BM25Index()
+
+    def search_page(self, query, cursor=None, page_size=RESULTS_PER_PAGE):
+        after = parse_cursor(cursor)
+        keyed = ((-score, kind, item_id) for (kind, item_id), score in self.bm25.scores(query).items())
+        if after is not None:
+            last = (-after[0], after[1], after[2])
+            keyed = (key for key in keyed if key > last)
+        page = heapq.nsmallest(page_size + 1, keyed)
+
+        shown = page[:page_size]
+        ids = defaultdict(list)
+        for _, kind, item_id in shown:
+            ids[kind].append(item_id)
+        shown_rows = Q()
+        for kind, item_ids in ids.items():
+            shown_rows |= Q(kind=kind, item_id__in=item_ids)
+        rows = {(row.kind, row.item_id): row for row in CatalogItem.objects.filter(shown_rows)} if shown else {}
+
+        results = []
+        for neg_score, kind, item_id in shown:
+            row = rows.get((kind, item_id))
+            if row is not None:
+                row.score = -neg_score
+                results.append(row)
+
+        next_cursor = None
+        if len(page) > page_size:
+            neg_score, kind, item_id = shown[-1]
+            next_cursor = make_cursor(-neg_score, kind, item_id)
+        return results, next_cursor
+
+    def index(self, item, version):
+        self.bm25.sync((item.kind, item.item_id), _weighted_terms(item), version)
+
+    def remove(self, item, version):
+        self.bm25.sync((item.kind, item.item_id), None, version)
+
+    def rebuild(self):
+        return self.bm25.rebuild()
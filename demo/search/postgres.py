@@ -0,0 +1,111 @@
+# demo/search/postgres.py
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector, TrigramSimilarity
+from django.db import connection, transaction
+from django.db.models import Case, F, FloatField, Q, Value, When
+from django.db.models.functions import Cast
+
+from homepage.models import CatalogItem
+from homepage.search_keys import normalize
+
+from .base import RESULTS_PER_PAGE, BaseSearchBackend, make_cursor, parse_cursor
+
+SEARCH_CONFIG = 'english'
+# Minimum pg_trgm similarity for a title to count as a (typo-tolerant) match; applied as
+# pg_trgm.similarity_threshold, which the indexable `title % query` operator compares against
+TRIGRAM_THRESHOLD = 0.3
+# Added to the score of rows whose search_key starts with the normalized query
+PREFIX_BONUS = 1.0
+
+
+# ==================== INDEXING ====================
+
+def catalog_search_vector():
+    return (
+        SearchVector('title', weight='A', config=SEARCH_CONFIG)
+        + SearchVector('category_label', weight='B', config=SEARCH_CONFIG)
+    )
+
+
+def update_search_vectors(items):
+    """Recompute the stored tsvector of every CatalogItem in `items`; returns the number updated"""
+    return items.update(search_vector=catalog_search_vector())
+
+
+# ==================== QUERYING ====================
+
+def _set_trigram_threshold():
+    # Transaction-local, like SET LOCAL: call inside the atomic block running the search
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT set_config('pg_trgm.similarity_threshold', %s, true)", [str(TRIGRAM_THRESHOLD)])
+
+
+def _ranked(queryset, query):
+    """Annotate `score` on matching rows, ordered best first with (kind, item_id) as the tie-breaker"""
+    tsquery = SearchQuery(query, search_type='websearch', config=SEARCH_CONFIG)
+    # Every branch is served by its own index (search_vector GIN, title gin_trgm_ops,
+    # search_key varchar_pattern_ops), so PostgreSQL can BitmapOr them instead of
+    # computing similarity() for every row
+    matches = Q(search_vector=tsquery) | Q(title__trigram_similar=query)
+    prefix_bonus = Value(0.0)
+    # search_key LIKE 'prefix%' is served by the varchar_pattern_ops index and
+    # matches transliterated Devanagari titles typed in Latin script
+    prefix = normalize(query)
+    if prefix:
+        matches |= Q(search_key__startswith=prefix)
+        prefix_bonus = Case(When(search_key__startswith=prefix, then=Value(PREFIX_BONUS)), default=Value(0.0))
+    return (
+        queryset.annotate(
+            rank=SearchRank(F('search_vector'), tsquery),
+            similarity=TrigramSimilarity('title', query),
+            prefix_bonus=prefix_bonus,
+        )
+        # float8 so the score round-trips exactly through the cursor (ts_rank is float4)
+        .annotate(score=Cast(F('rank') + F('similarity') + F('prefix_bonus'), FloatField()))
+        .filter(matches)
+        .order_by('-score', 'kind', 'item_id')
+    )
+
+
+def _after(queryset, cursor):
+    """Keep only rows that sort after the cursor key (score, kind, item_id)"""
+    if cursor is None:
+        return queryset
+    score, kind, item_id = cursor
+    return queryset.filter(
+        Q(score__lt=score)
+        | Q(score=score, kind__gt=kind)
+        | Q(score=score, kind=kind, item_id__gt=item_id)
+    )
+
+
+class PostgresSearchBackend(BaseSearchBackend):
+    """
+    Full-text search on the GIN-indexed CatalogItem.search_vector column, with
+    pg_trgm title similarity for typo tolerance.
+    """
+
+    def search_page(self, query, cursor=None, page_size=RESULTS_PER_PAGE):
+        """
+        Books and products come from one ranked query on CatalogItem, read with a
+        keyset filter past the cursor and at most page_size + 1 rows, so memory
+        and response size stay bounded however many rows match.
+        """
+        after = parse_cursor(cursor)
+        with transaction.atomic():
+            _set_trigram_threshold()
+            rows = list(_after(_ranked(CatalogItem.objects.all(), query), after)[:page_size + 1])
+        results = rows[:page_size]
+        next_cursor = None
+        if len(rows) > page_size:
+            last = results[-1]
+            next_cursor = make_cursor(last.score, last.kind, last.item_id)
+        return results, next_cursor
+
+    def index(self, item, version):
+        update_search_vectors(CatalogItem.objects.filter(kind=item.kind, item_id=item.item_id))
+
+    def index_many(self, items):
+        update_search_vectors(items)
+
+    def rebuild(self):
+        return update_search_vectors(CatalogItem.objects.all())
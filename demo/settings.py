@@ -46,6 +46,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'homepage',
     'product_categories',
     'user',
@@ -53,6 +54,8 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    # Outside the session/CSRF middleware so it sees the cookies and Vary they add
+    'demo.middleware.CacheControlMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -62,6 +65,51 @@ MIDDLEWARE = [
 ]
 
 ROOT_URLCONF = 'demo.urls'
+
+# Cache-Control per URL name (demo.middleware.CacheControlMiddleware). Public pages are the
+# same for everyone, so a CDN may keep them for s-maxage and serve them stale while it refetches.
+CACHE_POLICIES = {
+    'catalog': {'public': True, 'max_age': 60, 's_maxage': 600, 'stale_while_revalidate': 3600},
+    'search': {'public': True, 'max_age': 0, 's_maxage': 60, 'stale_while_revalidate': 300},
+    'page': {'public': True, 'max_age': 3600, 's_maxage': 86400, 'stale_while_revalidate': 86400},
+    'private': {'private': True, 'no_store': True, 'no_cache': True, 'must_revalidate': True, 'max_age': 0},
+}
+CACHE_POLICY_ROUTES = {
+    'home_page': 'catalog',
+    'book_detail': 'catalog',
+    'category_view': 'catalog',
+    'category_load_more': 'catalog',
+    'productcatagory': 'catalog',
+    'product_detail': 'catalog',
+    'search': 'search',
+    'search_suggestions': 'search',
+    'aboutus': 'page',
+    'contactinformation': 'page',
+    'return_policy': 'page',
+    'privacy_policy': 'page',
+    'add_to_cart': 'private',
+    'get_cart_items': 'private',
+    'get_cart_addons': 'private',
+    'update_cart_addons': 'private',
+    'update_cart_quantity': 'private',
+    'remove_from_cart': 'private',
+    'clear_cart': 'private',
+    'buy_now': 'private',
+    'checkout': 'private',
+    'check_checkout_lock': 'private',
+    'calculate_shipping': 'private',
+    'initiate_payu_payment': 'private',
+    'place_cod_order': 'private',
+    'payment_redirect': 'private',
+    'payment_success': 'private',
+    'payment_failure': 'private',
+    'clear_checkout_lock': 'private',
+    'clear_payment_session': 'private',
+    'order_tracking': 'private',
+    'shiprocket_product_status': 'private',
+    'shiprocket_order_details': 'private',
+    'shipment_webhook': 'private',
+}
 WSGI_APPLICATION = 'demo.wsgi.application'
 
 TEMPLATES = [
@@ -91,6 +139,28 @@ DATABASES = {
     }
 }
 
+# Cache shared by every worker and management command. The catalog version (homepage.cache)
+# and everything keyed on it only invalidate across processes when this is shared, so
+# production sets REDIS_URL; the per-process fallback is for single-process development.
+REDIS_URL = os.getenv('REDIS_URL', '')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+            'KEY_PREFIX': 'familybookstore',
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+# Search backend: empty picks PostgreSQL full-text search on PostgreSQL, in-process BM25 elsewhere
+SEARCH_BACKEND = os.getenv('SEARCH_BACKEND', '')
+
 # Payment Gateway Configuration
 PAYU_MERCHANT_KEY = os.getenv('PAYU_MERCHANT_KEY')
 PAYU_MERCHANT_SALT = os.getenv('PAYU_MERCHANT_SALT')
@@ -124,10 +194,48 @@ USE_TZ = True
 STATIC_URL = '/static/'
 STATIC_ROOT = BASE_DIR / 'staticfiles'
 STATICFILES_DIRS = [BASE_DIR / 'static']
+STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    # Minified, bundled, content-hashed names plus .gz/.br siblings; see demo/storage.py
+    'staticfiles': {'BACKEND': 'demo.storage.CompressedManifestStaticFilesStorage'},
+}
+# Hashed static names never change content, so they are cached for a year (demo.views.serve_static)
+STATIC_IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60
+
+# Per-page CSS/JS served as one file each outside DEBUG ({% static_bundle %}), members in cascade/execution order
+STATIC_BUNDLES = {
+    'bundles/site.css': ['css/style.css', 'css/base.css'],
+    'bundles/home.css': ['css/style.css'],
+    'bundles/book_detail.css': ['css/bookdetails.css', 'css/style.css'],
+    'bundles/aboutus.css': ['css/Aboutus.css', 'css/style.css'],
+    'bundles/bulk.css': ['css/bulk.css', 'css/style.css'],
+    'bundles/combo.css': ['css/style.css', 'css/sale.css'],
+    'bundles/contact.css': ['css/contactinformation.css', 'css/style.css'],
+    'bundles/productcatagory.css': ['css/productcatagory.css', 'css/style.css'],
+    'bundles/site.js': ['js/script.js', 'js/cart.js'],
+    'bundles/book_detail.js': ['js/script.js', 'js/cart.js', 'js/bookdetails.js'],
+    'bundles/checkout.js': ['js/script.js', 'js/cart.js', 'js/checkout.js', 'js/no-back-cache.js'],
+}
 
 # Media files
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
+MEDIA_CACHE_MAX_AGE = int(os.getenv('MEDIA_CACHE_MAX_AGE', 86400))
+
+# File transfer hand-off to the front proxy (demo.files.serve_file):
+# '' streams from Django, 'x-accel-redirect' for nginx, 'x-sendfile' for Apache/lighttpd.
+# For nginx, SENDFILE_ACCEL_PREFIX must be an `internal` location aliased to SENDFILE_ACCEL_ROOT.
+SENDFILE_BACKEND = os.getenv('SENDFILE_BACKEND', '')
+SENDFILE_ACCEL_ROOT = BASE_DIR
+SENDFILE_ACCEL_PREFIX = os.getenv('SENDFILE_ACCEL_PREFIX', '/internal/')
+
+# Content pages written by `manage.py prerender_pages` and served by demo.prerender. Local to each
+# host: catalog edits re-render productcatagory only where they were made (see demo.prerender)
+PRERENDER_ROOT = BASE_DIR / 'prerendered'
+
+# Homepage promo videos; posters and renditions are built into MEDIA_ROOT/video by build_video_renditions
+PROMO_VIDEO_DIR = BASE_DIR / 'static' / 'video'
+FFMPEG_BINARY = os.getenv('FFMPEG_BINARY', 'ffmpeg')
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
@@ -0,0 +1,92 @@
+# demo/storage.py
+import gzip
+
+import brotli
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files.base import ContentFile
+
+from .minify import minify_css, minify_js
+
+# Only the site's own assets are minified; third-party ones (admin) ship as they are
+MINIFY_PREFIXES = ('css/', 'js/')
+MINIFIERS = {'.css': minify_css, '.js': minify_js}
+COMPRESS_EXTENSIONS = ('.css', '.js', '.svg', '.json', '.txt', '.xml', '.map', '.html')
+COMPRESS_MIN_SIZE = 256
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """
+    ManifestStaticFilesStorage that, during collectstatic, also
+
+    - minifies the site's CSS/JS before it is hashed,
+    - concatenates settings.STATIC_BUNDLES into one file per page, hashed like
+      any other asset (see the static_bundle template tag), and
+    - writes .gz and .br siblings of every text asset for
+      demo.views.serve_static to negotiate.
+    """
+    manifest_strict = False
+
+    def stored_name(self, name):
+        try:
+            return super().stored_name(name)
+        except ValueError:
+            # A missing file renders its plain URL (a 404) rather than failing the whole page
+            return name
+
+    def post_process(self, paths, dry_run=False, **options):
+        if dry_run:
+            yield from super().post_process(paths, dry_run, **options)
+            return
+
+        self._minify(paths)
+        self._build_bundles(paths)
+        yield from super().post_process(paths, dry_run, **options)
+
+        names = set(paths) | set(self.hashed_files.values())
+        for name in sorted(names):
+            if name.endswith(COMPRESS_EXTENSIONS):
+                self._compress(name)
+
+    def _replace(self, name, content):
+        if self.exists(name):
+            self.delete(name)
+        self.save(name, ContentFile(content))
+
+    def _minify(self, paths):
+        """Overwrite the collected copies of the site's CSS/JS with minified ones and hash those"""
+        for name, (storage, path) in list(paths.items()):
+            minifier = MINIFIERS.get(name[name.rfind('.'):])
+            if not minifier or not name.startswith(MINIFY_PREFIXES):
+                continue
+            with storage.open(path) as f:
+                source = f.read().decode('utf-8')
+            self._replace(name, minifier(source).encode('utf-8'))
+            paths[name] = (self, name)
+
+    def _build_bundles(self, paths):
+        for bundle, members in getattr(settings, 'STATIC_BUNDLES', {}).items():
+            # A newline-prefixed ';' keeps a script without a trailing semicolon from running into the next
+            separator = '\n;\n' if bundle.endswith('.js') else '\n'
+            parts = []
+            for member in members:
+                if member not in paths:
+                    raise ValueError(f"STATIC_BUNDLES: {member!r} (in {bundle!r}) was not found by collectstatic")
+                storage, path = paths[member]
+                with storage.open(path) as f:
+                    parts.append(f.read().decode('utf-8').strip())
+            self._replace(bundle, (separator.join(parts) + '\n').encode('utf-8'))
+            paths[bundle] = (self, bundle)
+
+    def _compress(self, name):
+        with self.open(name) as f:
+            data = f.read()
+        if len(data) < COMPRESS_MIN_SIZE:
+            return
+        encoded = [
+            ('.gz', gzip.compress(data, compresslevel=9, mtime=0)),
+            ('.br', brotli.compress(data, quality=11)),
+        ]
+        for extension, compressed in encoded:
+            if len(compressed) < len(data):
+                self._replace(name + extension, compressed)
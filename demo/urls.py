@@ -1,7 +1,8 @@
+import re
+
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, include, re_path
 from django.conf import settings
-from django.conf.urls.static import static
 from django.views.decorators.csrf import csrf_exempt
 from . import views as demo_views
 from user import views as user_views  # only for webhook
@@ -28,6 +29,7 @@ urlpatterns = [
     path("category/<str:category>/", demo_views.category_books, name="category_books"),
     path("bulkpurchase/", demo_views.bulk_purchase, name="bulk_purchase"),
     path("buy-now/<int:book_id>/", demo_views.buy_now, name="buy_now"),
+    path("video/<path:name>", demo_views.serve_promo_video, name="promo_video"),
 
     # ============ PRODUCT CATEGORIES ============
     path("productcatagory/", include("product_categories.urls")),
@@ -38,6 +40,10 @@ urlpatterns = [
 
     # ============ ADMIN ============
     path("admin/", admin.site.urls),
-]
 
-urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+    # ============ STATIC (collectstatic output, precompressed; runserver serves it itself in DEBUG) ============
+    re_path(r"^%s(?P<path>.+)$" % re.escape(settings.STATIC_URL.lstrip("/")), demo_views.serve_static, name="static"),
+
+    # ============ MEDIA (uploads, with ranges and proxy hand-off) ============
+    re_path(r"^%s(?P<path>.+)$" % re.escape(settings.MEDIA_URL.lstrip("/")), demo_views.serve_media, name="media"),
+]
@@ -1,15 +1,19 @@
 from django.http import JsonResponse
 from django.shortcuts import render, redirect, get_object_or_404
-from django.db.models import Q
 
+from homepage.conditional import catalog_etag, catalog_last_modified
 from homepage.models import Book
-from product_categories.models import Product
+from .files import precompressed_path, serve_file
+from .prerender import serve_prerendered
+from .search import get_backend
 
 import logging
 from django.conf import settings
 from django.core.mail import send_mail
 from django.shortcuts import render
-from django.views.decorators.http import require_http_methods
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.views.decorators.http import condition, require_http_methods, require_safe
 import json
 
 logger = logging.getLogger(__name__)
@@ -20,50 +24,14 @@ def normalize_title(title):
     return title.lower().strip().replace(" ", "_")
 
 
+@condition(etag_func=catalog_etag, last_modified_func=catalog_last_modified)
 def search_suggestions(request):
     """Return JSON search results for live autocomplete - no duplicates"""
     query = request.GET.get("q", "").strip()
     results = []
-    seen_titles = set()
 
     if len(query) >= 2:
-        # Search books from homepage
-        books = Book.objects.filter(
-            Q(title__icontains=query) | Q(category__icontains=query)
-        )[:5]
-
-        for book in books:
-            title_lower = book.title.lower().strip()
-            if title_lower not in seen_titles:
-                seen_titles.add(title_lower)
-                results.append(
-                    {
-                        "title": book.title,
-                        "price": str(book.price),
-                        "image": book.image.url if book.image else "",
-                        "url": f"/books/{book.slug}/",
-                        "type": "Book",
-                    }
-                )
-
-        # Search products from product_categories
-        products = Product.objects.filter(
-            Q(title__icontains=query) | Q(category__name__icontains=query)
-        )[:5]
-
-        for product in products:
-            title_lower = product.title.lower().strip()
-            if title_lower not in seen_titles:
-                seen_titles.add(title_lower)
-                results.append(
-                    {
-                        "title": product.title,
-                        "price": str(product.price),
-                        "image": product.image.url if product.image else "",
-                        "url": f"/product/{product.id}/",
-                        "type": "Product",
-                    }
-                )
+        results = get_backend().suggest(query)
 
     return JsonResponse({"results": results})
 
@@ -93,20 +61,24 @@ def search(request):
     """Handle search page requests"""
     query = request.GET.get("q", "").strip()
     results = []
+    next_cursor = None
 
     if query:
-        book_results = Book.objects.filter(
-            Q(title__icontains=query) | Q(category__icontains=query)
-        )
-        product_results = Product.objects.filter(
-            Q(title__icontains=query) | Q(category__name__icontains=query)
-        )
-        results = list(book_results) + list(product_results)
+        try:
+            results, next_cursor = get_backend().search_page(query, request.GET.get("cursor"))
+        except ValueError:
+            # Stale or tampered cursor - start from the first page
+            results, next_cursor = get_backend().search_page(query)
 
     return render(
         request,
         "pages/search_results.html",
-        {"query": query, "results": results},
+        {
+            "query": query,
+            "results": results,
+            "next_cursor": next_cursor,
+            "is_first_page": not request.GET.get("cursor"),
+        },
     )
 
 
@@ -114,10 +86,12 @@ def home_page(request):
     return render(request, "index.html")
 
 
+@serve_prerendered('aboutus')
 def Aboutus(request):
     return render(request, "pages/Aboutus.html")
 
 
+@serve_prerendered('contactinformation')
 def contact_information(request):
     return render(request, "pages/contactinformation.html")
 
@@ -203,10 +177,12 @@ Family BookStore System
     return render(request, "pages/bulk.html")
 
 
+@serve_prerendered('return_policy')
 def return_policy(request):
     return render(request, "pages/return_policy.html")
 
 
+@serve_prerendered('privacy_policy')
 def privacy_policy(request):
     return render(request, "pages/privacy_policy.html")
 
@@ -225,3 +201,31 @@ def category_books(request, category):
         "pages/category_books.html",
         {"books": books, "category": category},
     )
+
+
+@require_safe
+def serve_media(request, path):
+    """Uploaded covers and their variants; see demo.files.serve_file"""
+    return serve_file(request, settings.MEDIA_ROOT, path, max_age=settings.MEDIA_CACHE_MAX_AGE)
+
+
+@require_safe
+def serve_static(request, path):
+    """
+    collectstatic output outside DEBUG, with the .br/.gz sibling written by
+    demo.storage when the client accepts it. Hashed names never change, so
+    they are cached for good; unhashed ones are revalidated on every use.
+    """
+    response = serve_file(request, settings.STATIC_ROOT, precompressed_path(request, settings.STATIC_ROOT, path))
+    if path in getattr(staticfiles_storage, 'hashed_files', {}).values():
+        patch_cache_control(response, public=True, max_age=settings.STATIC_IMMUTABLE_MAX_AGE, immutable=True)
+    else:
+        patch_cache_control(response, no_cache=True)
+    patch_vary_headers(response, ['Accept-Encoding'])
+    return response
+
+
+@require_safe
+def serve_promo_video(request, name):
+    """Original promo videos, used until build_video_renditions has run"""
+    return serve_file(request, settings.PROMO_VIDEO_DIR, name, max_age=settings.MEDIA_CACHE_MAX_AGE)
@@ -16,8 +16,8 @@ class BookAdmin(admin.ModelAdmin):
             'fields': ('price', 'old_price', 'on_sale')
         }),
         ('Date Information', {
-            'fields': ('date_added',),
+            'fields': ('date_added', 'updated_at'),
         }),
     )
 
-    readonly_fields = ('date_added',)
+    readonly_fields = ('date_added', 'updated_at')
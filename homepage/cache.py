@@ -0,0 +1,45 @@
+# homepage/cache.py
+import time
+
+from django.core.cache import cache
+from django.db.models import F, Value
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from .models import CatalogRevision
+
+CATALOG_VERSION_KEY = 'catalog:version'
+
+
+def get_catalog_version():
+    """
+    Return the current catalog version.
+    Seeded from the clock so a cache flush never re-uses an old version number.
+    """
+    version = cache.get(CATALOG_VERSION_KEY)
+    if version is None:
+        cache.add(CATALOG_VERSION_KEY, int(time.time() * 1000), timeout=None)
+        version = cache.get(CATALOG_VERSION_KEY)
+    return version
+
+
+def advance_catalog_revision():
+    """Count one catalog change in the CatalogRevision row; its time never goes backwards"""
+    updated = CatalogRevision.objects.filter(pk=CatalogRevision.ID).update(
+        number=F('number') + 1,
+        changed_at=Greatest(F('changed_at'), Value(timezone.now())),
+    )
+    if not updated:
+        CatalogRevision.objects.get_or_create(pk=CatalogRevision.ID, defaults={'number': 1})
+
+
+def bump_catalog_version():
+    """Invalidate everything keyed on the catalog version, and advance the stored catalog revision"""
+    advance_catalog_revision()
+    try:
+        return cache.incr(CATALOG_VERSION_KEY)
+    except ValueError:
+        # Key missing (flushed or never set) - seed a fresh version
+        version = int(time.time() * 1000)
+        cache.set(CATALOG_VERSION_KEY, version, timeout=None)
+        return version
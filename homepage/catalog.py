@@ -0,0 +1,111 @@
+# homepage/catalog.py
+"""
+Keeps CatalogItem, the one-table read copy of Books and Products, in step with
+its sources: the model signals sync single rows, the Book/Product querysets
+sync the rows their bulk writes touch (models.CatalogSourceQuerySet), and
+`manage.py refresh_catalog` rebuilds it from scratch.
+"""
+from django.db import transaction
+from django.utils import timezone
+
+from product_categories.models import Product
+
+from .models import Book, CatalogItem
+
+SYNC_BATCH_SIZE = 1000
+# Copied as-is from the Book/Product row
+COPIED_FIELDS = (
+    'title', 'slug', 'price', 'old_price', 'on_sale', 'search_key',
+    'image', 'image_variants', 'image_width', 'image_height', 'image_placeholder',
+)
+UPDATED_FIELDS = COPIED_FIELDS + ('category', 'category_label', 'updated_at')
+
+
+def item_kind(model):
+    return CatalogItem.BOOK if model is Book else CatalogItem.PRODUCT
+
+
+def catalog_item(instance):
+    """Unsaved CatalogItem mirroring a Book or Product (a Product's category should be loaded)"""
+    if isinstance(instance, Book):
+        category, label = instance.category, instance.get_category_display()
+    else:
+        category, label = instance.category.type, instance.category.name
+    return CatalogItem(
+        kind=item_kind(type(instance)),
+        item_id=instance.pk,
+        category=category,
+        category_label=label,
+        **{name: getattr(instance, name) for name in COPIED_FIELDS},
+    )
+
+
+def _upsert(items):
+    CatalogItem.objects.bulk_create(
+        items,
+        batch_size=SYNC_BATCH_SIZE,
+        update_conflicts=True,
+        unique_fields=['kind', 'item_id'],
+        update_fields=UPDATED_FIELDS,
+    )
+
+
+def sync_catalog_item(instance):
+    """Insert or update the row of one saved Book/Product; returns it"""
+    item = catalog_item(instance)
+    _upsert([item])
+    return item
+
+
+def remove_catalog_item(instance):
+    """Delete the row of a deleted Book/Product; returns an unsaved stand-in carrying its key"""
+    kind = item_kind(type(instance))
+    CatalogItem.objects.filter(kind=kind, item_id=instance.pk).delete()
+    return CatalogItem(kind=kind, item_id=instance.pk)
+
+
+def _sources(model):
+    return model.objects.select_related('category') if model is Product else model.objects.all()
+
+
+def sync_catalog_items(model, ids):
+    """
+    Upsert the rows of many Books or Products written without signals (called by
+    CatalogSourceQuerySet); returns a queryset of the synced CatalogItems.
+    """
+    ids = list(ids)
+    for start in range(0, len(ids), SYNC_BATCH_SIZE):
+        chunk = ids[start:start + SYNC_BATCH_SIZE]
+        _upsert([catalog_item(instance) for instance in _sources(model).filter(pk__in=chunk)])
+    return CatalogItem.objects.filter(kind=item_kind(model), item_id__in=ids)
+
+
+def sync_variety(variety):
+    """
+    Carry a product_variety's type and name over to its products' rows; returns a
+    queryset of those rows.
+    """
+    items = CatalogItem.objects.filter(
+        kind=CatalogItem.PRODUCT,
+        item_id__in=Product.objects.filter(category=variety).values('id'),
+    )
+    items.update(category=variety.type, category_label=variety.name, updated_at=timezone.now())
+    return items
+
+
+def rebuild_catalog():
+    """Replace every CatalogItem with fresh copies of the Books and Products; returns the row count"""
+    count = 0
+    with transaction.atomic():
+        CatalogItem.objects.all().delete()
+        for model in (Book, Product):
+            batch = []
+            for instance in _sources(model).iterator(chunk_size=SYNC_BATCH_SIZE):
+                batch.append(catalog_item(instance))
+                if len(batch) >= SYNC_BATCH_SIZE:
+                    CatalogItem.objects.bulk_create(batch)
+                    count += len(batch)
+                    batch = []
+            CatalogItem.objects.bulk_create(batch)
+            count += len(batch)
+    return count
@@ -0,0 +1,148 @@
+# homepage/catalog_import.py
+import csv
+import json
+from dataclasses import dataclass, field
+from itertools import islice
+
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
+
+from demo.prerender import refresh_prerendered
+from product_categories.models import product_variety
+
+from .cache import bump_catalog_version
+from .category_stats import category_code, refresh_category_stats
+from .models import Book
+from .search_keys import search_key
+from .slugs import allocate_slugs
+
+IMPORT_BATCH_SIZE = 1000
+# Tries per batch when concurrent inserts keep taking the allocated slugs
+SLUG_ATTEMPTS = 3
+# Optional columns copied onto the model; `title` and `category` are required
+IMPORT_FIELDS = ('price', 'old_price', 'on_sale', 'description', 'image')
+TRUE_VALUES = ('1', 'true', 'yes', 'y', 't')
+
+
+@dataclass
+class ImportResult:
+    created: int = 0
+    errors: list = field(default_factory=list)  # (line number, message)
+
+
+def read_rows(path, fmt=None):
+    """
+    Stream (line number, row dict) from a CSV file with a header row or from a
+    JSON Lines file. The format follows the file extension unless given.
+    Unparseable JSON lines come through as (line number, None).
+    """
+    fmt = fmt or ('jsonl' if path.endswith(('.jsonl', '.ndjson')) else 'csv')
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        if fmt == 'csv':
+            reader = csv.DictReader(f)
+            for row in reader:
+                yield reader.line_num, row
+        else:
+            for line_number, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    yield line_number, json.loads(line)
+                except json.JSONDecodeError:
+                    yield line_number, None
+
+
+def _category_resolver(model):
+    """Map the `category` column to a model value: a Book category code or a product_variety type code"""
+    if model is Book:
+        codes = {code for code, _ in Book.CATEGORY_CHOICES}
+        return lambda value: value if value in codes else None
+    varieties = product_variety.objects.in_bulk(field_name='type')
+    return varieties.get
+
+
+def _build(model, row, resolve_category):
+    """Turn one row into an unsaved instance; raises ValidationError on bad data"""
+    if row is None:
+        raise ValidationError("invalid JSON")
+    if not isinstance(row, dict):
+        raise ValidationError("not a JSON object")
+    title = str(row.get('title') or '').strip()
+    if not title:
+        raise ValidationError("missing title")
+    category = resolve_category(str(row.get('category') or '').strip())
+    if category is None:
+        raise ValidationError(f"unknown category {row.get('category')!r}")
+
+    instance = model(title=model._meta.get_field('title').clean(title, None), category=category)
+    for name in IMPORT_FIELDS:
+        value = row.get(name)
+        if value is None or value == '':
+            continue
+        model_field = model._meta.get_field(name)
+        if name == 'on_sale' and isinstance(value, str):
+            value = value.strip().lower() in TRUE_VALUES
+        # clean() also runs the field validators (max_digits, max_length) the database would enforce
+        setattr(instance, name, model_field.clean(value, instance))
+    if instance.price is None:
+        raise ValidationError("missing price")
+    return instance
+
+
+def _insert_batch(model, instances):
+    """
+    Allocate slugs for the whole batch in one query, then insert it and its
+    CatalogItems. A slug taken by a concurrent insert in the meantime fails the
+    insert with IntegrityError; the batch then gets fresh slugs and is retried.
+    """
+    for instance in instances:
+        instance.search_key = search_key(instance.title)
+    for attempt in range(1, SLUG_ATTEMPTS + 1):
+        slugs = allocate_slugs(model, [instance.title for instance in instances])
+        for instance, slug in zip(instances, slugs):
+            instance.slug = slug
+        try:
+            with transaction.atomic():
+                # Also inserts the CatalogItems (CatalogSourceQuerySet)
+                model.objects.bulk_create(instances)
+            return
+        except IntegrityError:
+            if attempt == SLUG_ATTEMPTS:
+                raise
+
+
+def import_catalog(rows, model, batch_size=IMPORT_BATCH_SIZE):
+    """
+    Insert Books or Products from (line number, row) pairs, batch_size rows per
+    bulk_create. Invalid rows are skipped and reported; each batch commits on its own.
+
+    bulk_create skips save() and the model signals, so slugs, search keys and
+    CatalogItems are filled in here per batch, and the category stats and
+    catalog version are refreshed once at the end.
+    """
+    result = ImportResult()
+    resolve_category = _category_resolver(model)
+    rows = iter(rows)
+    categories = set()
+    while True:
+        batch = list(islice(rows, batch_size))
+        if not batch:
+            break
+        instances = []
+        for line_number, row in batch:
+            try:
+                instances.append(_build(model, row, resolve_category))
+            except ValidationError as e:
+                result.errors.append((line_number, '; '.join(e.messages)))
+        if instances:
+            _insert_batch(model, instances)
+            categories.update(category_code(instance) for instance in instances)
+            result.created += len(instances)
+
+    if result.created:
+        refresh_category_stats(model, categories)
+        bump_catalog_version()
+        if model is Book:
+            # productcatagory shows per-category book counts
+            refresh_prerendered('productcatagory')
+    return result
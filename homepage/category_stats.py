@@ -0,0 +1,100 @@
+# homepage/category_stats.py
+from django.core.cache import cache
+from django.db.models import Count, Max, Min, Q
+
+from .cache import get_catalog_version
+from .models import Book, CategoryStats
+
+STATS_CACHE_KEY = 'catalog:category-stats:{version}'
+STATS_CACHE_TIMEOUT = 24 * 60 * 60
+STATS_FIELDS = ('total', 'on_sale', 'min_price', 'max_price')
+
+
+def _catalog(model):
+    return CategoryStats.BOOK if model is Book else CategoryStats.PRODUCT
+
+
+def _category_field(model):
+    """Lookup giving the category code: Book.category, or the type of a Product's product_variety"""
+    return 'category' if model is Book else 'category__type'
+
+
+def category_code(instance):
+    """Category code of a Book/Product, as stored in CategoryStats.category"""
+    return instance.category if isinstance(instance, Book) else instance.category.type
+
+
+def refresh_category_stats(model, categories):
+    """
+    Recompute the CategoryStats rows of `categories` (codes) for `model` with
+    one grouped aggregate over just those categories (an index range scan, see
+    book_category_title / product_category_title) and upsert them in one query.
+    Categories left without rows are stored as zero.
+    """
+    categories = {code for code in categories if code}
+    if not categories:
+        return
+    field = _category_field(model)
+    rows = (
+        model.objects.filter(**{f'{field}__in': categories})
+        .values(field)
+        .annotate(
+            total=Count('id'),
+            on_sale=Count('id', filter=Q(on_sale=True)),
+            min_price=Min('price'),
+            max_price=Max('price'),
+        )
+        .order_by()
+    )
+    found = {row[field]: row for row in rows}
+    catalog = _catalog(model)
+    CategoryStats.objects.bulk_create(
+        [
+            CategoryStats(catalog=catalog, category=code, **{
+                name: found.get(code, {}).get(name, 0 if name in ('total', 'on_sale') else None)
+                for name in STATS_FIELDS
+            })
+            for code in sorted(categories)
+        ],
+        update_conflicts=True,
+        unique_fields=['catalog', 'category'],
+        update_fields=[*STATS_FIELDS, 'updated_at'],
+    )
+
+
+def rebuild_category_stats():
+    """Recompute every row from scratch and drop rows of categories that no longer exist"""
+    from product_categories.models import Product, product_variety
+
+    book_codes = {code for code, _ in Book.CATEGORY_CHOICES} | set(
+        Book.objects.values_list('category', flat=True).distinct().order_by()
+    )
+    product_codes = set(product_variety.objects.values_list('type', flat=True))
+    refresh_category_stats(Book, book_codes)
+    refresh_category_stats(Product, product_codes)
+    CategoryStats.objects.filter(catalog=CategoryStats.BOOK).exclude(category__in=book_codes).delete()
+    CategoryStats.objects.filter(catalog=CategoryStats.PRODUCT).exclude(category__in=product_codes).delete()
+
+
+def category_stats(catalog=CategoryStats.BOOK):
+    """
+    {category code: CategoryStats} for one catalog. Read from the table once
+    per catalog version (the signals refresh the table before bumping it).
+    """
+    version = get_catalog_version()
+    key = STATS_CACHE_KEY.format(version=version)
+    stats = cache.get(key)
+    if stats is None:
+        stats = {CategoryStats.BOOK: {}, CategoryStats.PRODUCT: {}}
+        for row in CategoryStats.objects.all():
+            stats[row.catalog][row.category] = row
+        cache.set(key, stats, STATS_CACHE_TIMEOUT)
+    return stats[catalog]
+
+
+def shelf_count(config):
+    """Number of books on a category page/shelf config (see homepage.shelves.CATEGORY_SLUG_MAP)"""
+    stats = category_stats().get(config['category'])
+    if stats is None:
+        return 0
+    return stats.on_sale if config['on_sale'] else stats.total
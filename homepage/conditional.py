@@ -0,0 +1,47 @@
+# homepage/conditional.py
+"""
+Validators for conditional GET on catalog responses, for use with
+django.views.decorators.http.condition. Both are derived from the database,
+never from per-process state, so every worker hands out the same ETag for the
+same catalog and none can answer 304 for content it has not seen change.
+"""
+from django.core.cache import cache
+
+from .models import CatalogRevision, RecommendationRun
+
+CATALOG_STATE_KEY = 'catalog:state'
+# How long a process reuses one read of the catalog state; bounds how late a validator can change
+CATALOG_STATE_TIMEOUT = 5
+
+
+def catalog_state():
+    """
+    (revision number, time of the last change, newest recommendation run) of the
+    catalog. The CatalogRevision row is advanced by every catalog version bump,
+    deletions included; recommendation runs change the "You might also like"
+    blocks. Both are primary key lookups.
+    """
+    state = cache.get(CATALOG_STATE_KEY)
+    if state is None:
+        revision = (
+            CatalogRevision.objects.filter(pk=CatalogRevision.ID).values_list('number', 'changed_at').first()
+            or (0, None)
+        )
+        run = RecommendationRun.objects.order_by('-id').values_list('created_at', flat=True).first()
+        state = (*revision, run)
+        cache.set(CATALOG_STATE_KEY, state, CATALOG_STATE_TIMEOUT)
+    return state
+
+
+def catalog_etag(request, *args, **kwargs):
+    """Weak ETag naming the catalog state a response was built from (renders are not byte-identical)"""
+    number, _, run = catalog_state()
+    stamp = f'{run.timestamp():.6f}' if run else '0'
+    return f'W/"catalog-{number}-{stamp}"'
+
+
+def catalog_last_modified(request=None, *args, **kwargs):
+    """Time of the last catalog change or recommendation run, None if neither happened yet"""
+    _, latest, run = catalog_state()
+    candidates = [value for value in (latest, run) if value is not None]
+    return max(candidates) if candidates else None
@@ -0,0 +1,132 @@
+# homepage/images.py
+import io
+import logging
+import posixpath
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps
+
+logger = logging.getLogger(__name__)
+
+# Covers render at most ~260 CSS px wide; these cover 1x-3x screens
+VARIANT_WIDTHS = (240, 480, 720)
+# (format, Pillow format, extension, save options), preferred format first
+VARIANT_FORMATS = (
+    ('webp', 'WEBP', 'webp', {'quality': 80, 'method': 6}),
+    ('jpeg', 'JPEG', 'jpg', {'quality': 82, 'optimize': True, 'progressive': True}),
+)
+VARIANT_DIR = 'variants'
+
+
+def variant_name(name, width, fmt):
+    """
+    books/cover.png -> books/variants/cover.png-480w.webp. The source extension
+    stays in the name so cover.png and cover.jpg do not share variants.
+    """
+    directory, filename = posixpath.split(name)
+    extension = dict((f, ext) for f, _, ext, _ in VARIANT_FORMATS)[fmt]
+    return posixpath.join(directory, VARIANT_DIR, f"{filename}-{width}w.{extension}")
+
+
+def _flatten(image):
+    """RGB copy of `image` with EXIF rotation applied and transparency over white"""
+    image = ImageOps.exif_transpose(image)
+    if image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info):
+        image = image.convert('RGBA')
+        background = Image.new('RGB', image.size, (255, 255, 255))
+        background.paste(image, mask=image.getchannel('A'))
+        return background
+    return image.convert('RGB')
+
+
+def dominant_colour(image):
+    """Most common colour of a small, 8-colour reduction of `image`, as #rrggbb"""
+    small = image.copy()
+    small.thumbnail((64, 64))
+    reduced = small.quantize(colors=8)
+    _, index = max(reduced.getcolors())
+    r, g, b = reduced.getpalette()[index * 3:index * 3 + 3]
+    return f"#{r:02x}{g:02x}{b:02x}"
+
+
+def _write_variants(name, image, storage):
+    widths = [width for width in VARIANT_WIDTHS if width < image.width] or [image.width]
+    for width in widths:
+        height = max(1, round(image.height * width / image.width))
+        resized = image.resize((width, height), Image.LANCZOS)
+        for fmt, pillow_format, _, options in VARIANT_FORMATS:
+            buffer = io.BytesIO()
+            resized.save(buffer, pillow_format, **options)
+            target = variant_name(name, width, fmt)
+            if storage.exists(target):
+                storage.delete(target)
+            storage.save(target, ContentFile(buffer.getvalue()))
+    return widths
+
+
+def process_image(name, variants=True, storage=default_storage):
+    """
+    Read the stored image `name` once and return its intrinsic `width`/`height`
+    (after EXIF rotation) and `placeholder` colour. With `variants`, also write
+    WebP and JPEG copies at every VARIANT_WIDTHS narrower than the original (or
+    one copy at the original width if it is narrower than all of them) and add
+    the widths written, smallest first, as `widths`.
+    """
+    with storage.open(name, 'rb') as f:
+        with Image.open(f) as original:
+            image = _flatten(original)
+
+    data = {'width': image.width, 'height': image.height, 'placeholder': dominant_colour(image)}
+    if variants:
+        data['widths'] = _write_variants(name, image, storage)
+    return data
+
+
+def image_fields(name, data):
+    """Model field values for the result of process_image(name)"""
+    fields = {
+        'image_width': data['width'],
+        'image_height': data['height'],
+        'image_placeholder': data['placeholder'],
+    }
+    if 'widths' in data:
+        fields['image_variants'] = {'source': name, 'widths': data['widths']}
+    return fields
+
+
+def refresh_image_data(instance):
+    """
+    Bring the variants, dimensions and placeholder of a Book/Product up to date
+    after a save: everything is rebuilt when the image changed, only the
+    placeholder data when it was never computed. Returns True if it did any work.
+    """
+    name = instance.image.name if instance.image else ''
+    built_for = (instance.image_variants or {}).get('source', '')
+    if name == built_for and (not name or instance.image_placeholder):
+        return False
+
+    image_changed = name != built_for
+    fields = {'image_width': None, 'image_height': None, 'image_placeholder': ''}
+    if image_changed:
+        fields['image_variants'] = {}
+    if name:
+        try:
+            fields.update(image_fields(name, process_image(name, variants=image_changed)))
+        except (OSError, Image.DecompressionBombError):
+            logger.warning(f"Could not process image {name}", exc_info=True)
+    type(instance).objects.filter(pk=instance.pk).update(**fields)
+    for field_name, value in fields.items():
+        setattr(instance, field_name, value)
+    return True
+
+
+def srcset(instance, fmt='jpeg'):
+    """`srcset` attribute value for a Book/Product image, '' until variants exist"""
+    variants = instance.image_variants
+    if not variants or not instance.image or variants.get('source') != instance.image.name:
+        return ''
+    return ', '.join(
+        f"{default_storage.url(variant_name(variants['source'], width, fmt))} {width}w"
+        for width in variants['widths']
+    )
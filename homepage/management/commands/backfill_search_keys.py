@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand
+
+from homepage.cache import bump_catalog_version
+from homepage.models import Book
+from homepage.search_keys import search_key
+from product_categories.models import Product
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the normalized search_key of every Book and Product and carry the "
+        "changed keys over to their CatalogItems"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        updated = 0
+        for model in (Book, Product):
+            changed = []
+            for item in model.objects.only('id', 'title', 'search_key').iterator(chunk_size=batch_size):
+                key = search_key(item.title)
+                if item.search_key != key:
+                    item.search_key = key
+                    changed.append(item)
+            # Also updates the CatalogItems (CatalogSourceQuerySet)
+            model.objects.bulk_update(changed, ['search_key'], batch_size=batch_size)
+            updated += len(changed)
+            self.stdout.write(self.style.SUCCESS(f"{model.__name__}: updated {len(changed)} search keys"))
+        if updated:
+            # Autocomplete and BM25 indexes in every process reload from the new keys
+            bump_catalog_version()
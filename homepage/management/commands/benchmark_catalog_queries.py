@@ -0,0 +1,144 @@
+import random
+import re
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Q
+
+from homepage.models import Book
+from homepage.pagination import PAGE_SIZE
+from homepage.shelves import CATEGORY_SLUG_MAP, shelf_books, shelf_filter
+from product_categories.models import Product, product_variety
+
+SEED_BATCH_SIZE = 5000
+WORDS = (
+    'atomic', 'habits', 'silent', 'river', 'money', 'mind', 'secret', 'garden', 'ocean', 'night',
+    'empire', 'shadow', 'market', 'dragon', 'letters', 'winter', 'rich', 'poor', 'dad', 'life',
+)
+# Plan lines meaning a whole table was read: PostgreSQL, then SQLite ("SCAN t" without "USING")
+FULL_SCAN_RES = (re.compile(r'Seq Scan on (\w+)'), re.compile(r'\bSCAN (\w+)(?! USING)'))
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a large throwaway catalog, then EXPLAIN and time the hot catalog queries, "
+        "failing if any of them stops using its index. Everything is rolled back unless --keep."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--books', type=int, default=50000, help="Books to seed (default 50000)")
+        parser.add_argument('--products', type=int, default=20000, help="Products to seed (default 20000)")
+        parser.add_argument('--runs', type=int, default=20, help="Timed runs per query (default 20)")
+        parser.add_argument('--keep', action='store_true', help="Commit the seeded rows instead of rolling back")
+        parser.add_argument('--seed', type=int, default=0, help="Random seed for the generated titles")
+
+    def handle(self, *args, **options):
+        self.verbosity = options['verbosity']
+        rng = random.Random(options['seed'])
+        with transaction.atomic():
+            self._seed(rng, options['books'], options['products'])
+            self._analyze()
+            results = [self._check(name, queryset, indexes, options['runs']) for name, queryset, indexes in self._queries()]
+            if not options['keep']:
+                transaction.set_rollback(True)
+
+        failures = 0
+        for name, median_ms, used, full_scans, ok in results:
+            status = self.style.SUCCESS('ok') if ok else self.style.ERROR('FAIL')
+            detail = ', '.join(used) or 'no index'
+            if full_scans:
+                detail += f"; full scan of {', '.join(full_scans)}"
+            self.stdout.write(f"{status:>4}  {name:<28} {median_ms:8.2f} ms  {detail}")
+            failures += not ok
+        if failures:
+            raise CommandError(f"{failures} quer{'y' if failures == 1 else 'ies'} did not use the expected index")
+
+    def _title(self, rng, i):
+        return f"{' '.join(rng.sample(WORDS, 3)).title()} {i}"
+
+    def _seed(self, rng, book_count, product_count):
+        categories = [code for code, _ in Book.CATEGORY_CHOICES]
+        for start in range(0, book_count, SEED_BATCH_SIZE):
+            Book.objects.bulk_create([
+                Book(
+                    title=self._title(rng, i),
+                    slug=f'benchmark-book-{i}',
+                    category=rng.choice(categories),
+                    price=rng.randint(99, 999),
+                    on_sale=rng.random() < 0.3,
+                )
+                for i in range(start, min(start + SEED_BATCH_SIZE, book_count))
+            ])
+
+        # bulk_create, not get_or_create: no signals (and no prerendering) for throwaway rows
+        existing = set(product_variety.objects.values_list('type', flat=True))
+        product_variety.objects.bulk_create([
+            product_variety(type=code, name=label, image='product_categories/benchmark.png')
+            for code, label in product_variety.PRODUCT_TYPE_CHOICE if code not in existing
+        ])
+        varieties = list(product_variety.objects.all())
+        for start in range(0, product_count, SEED_BATCH_SIZE):
+            Product.objects.bulk_create([
+                Product(
+                    title=self._title(rng, i),
+                    slug=f'benchmark-product-{i}',
+                    category=rng.choice(varieties),
+                    price=rng.randint(99, 999),
+                    on_sale=rng.random() < 0.3,
+                )
+                for i in range(start, min(start + SEED_BATCH_SIZE, product_count))
+            ])
+        self.stdout.write(f"Seeded {book_count} books and {product_count} products")
+
+    def _analyze(self):
+        with connection.cursor() as cursor:
+            for model in (Book, Product):
+                cursor.execute(f'ANALYZE {connection.ops.quote_name(model._meta.db_table)}')
+
+    def _queries(self):
+        """(name, queryset, acceptable index names) for each hot catalog query"""
+        plain = next(config for config in CATEGORY_SLUG_MAP.values() if not config['on_sale'])
+        sale = next(config for config in CATEGORY_SLUG_MAP.values() if config['on_sale'])
+        category_page = Book.objects.filter(shelf_filter(plain)).order_by('title', 'id')
+        middle = category_page[PAGE_SIZE * 10:PAGE_SIZE * 10 + 1].first()
+        cursor_title, cursor_id = (middle.title, middle.id) if middle else ('', 0)
+        variety = product_variety.objects.order_by('type').first()
+
+        yield 'category page', category_page[:PAGE_SIZE + 1], {'book_category_title'}
+        # The seek keyset_page() does for ?cursor=
+        next_page = category_page.filter(Q(title__gt=cursor_title) | Q(title=cursor_title, id__gt=cursor_id))
+        yield 'category page (keyset)', next_page[:PAGE_SIZE + 1], {'book_category_title'}
+        yield 'sale shelf page', Book.objects.filter(shelf_filter(sale)).order_by('title', 'id')[:PAGE_SIZE + 1], {'book_sale_category_title'}
+        yield 'homepage shelves', shelf_books(), {'book_category_title', 'book_sale_category_title'}
+        yield 'book admin changelist', Book.objects.order_by('-date_added')[:100], {'book_date_added_desc'}
+        yield 'product category page', Product.objects.filter(category=variety).order_by('title', 'id')[:PAGE_SIZE + 1], {'product_category_title'}
+        yield 'product admin changelist', Product.objects.order_by('-date_added')[:100], {'product_date_added_desc'}
+
+    def _explain(self, queryset):
+        if connection.vendor == 'sqlite':
+            # QuerySet.explain() misplaces EXPLAIN QUERY PLAN when the query is wrapped in a subquery (window filters)
+            sql, params = queryset.query.sql_with_params()
+            with connection.cursor() as cursor:
+                cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+                return '\n'.join(' '.join(str(column) for column in row) for row in cursor.fetchall())
+        return queryset.explain()
+
+    def _check(self, name, queryset, indexes, runs):
+        plan = self._explain(queryset)
+        if self.verbosity >= 2:
+            self.stdout.write(f"--- {name}\n{plan}")
+        used = sorted(index for index in indexes if re.search(rf'\b{index}\b', plan))
+        tables = {Book._meta.db_table, Product._meta.db_table}
+        full_scans = sorted({
+            match.group(1) for pattern in FULL_SCAN_RES for match in pattern.finditer(plan)
+            if match.group(1) in tables
+        })
+
+        timings = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            list(queryset.all())
+            timings.append((time.perf_counter() - start) * 1000)
+        return name, statistics.median(timings), used, full_scans, bool(used) and not full_scans
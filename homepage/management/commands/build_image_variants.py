@@ -0,0 +1,72 @@
+import os
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import django
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from homepage.cache import bump_catalog_version
+from homepage.images import image_fields, process_image
+from homepage.models import Book
+from product_categories.models import Product
+
+IMAGE_FIELDS = ('id', 'image', 'image_variants', 'image_width', 'image_height', 'image_placeholder')
+
+
+class Command(BaseCommand):
+    help = (
+        "Build the resized WebP/JPEG copies, dimensions and placeholder colour "
+        "of every Book and Product image using a process pool"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=os.cpu_count(), help="Worker processes")
+        parser.add_argument('--force', action='store_true', help="Rebuild images that are already up to date")
+
+    def handle(self, *args, **options):
+        # image name -> rows using it; several rows may share one upload
+        pending = defaultdict(list)
+        needs_variants = set()
+        for model in (Book, Product):
+            for item in model.objects.exclude(image='').exclude(image__isnull=True).only(*IMAGE_FIELDS):
+                name = item.image.name
+                stale = item.image_variants.get('source') != name
+                if options['force'] or stale or not item.image_placeholder:
+                    pending[name].append(item)
+                    if options['force'] or stale:
+                        needs_variants.add(name)
+
+        if not pending:
+            self.stdout.write("All images are up to date")
+            return
+
+        # Forked workers must not inherit open database connections
+        connections.close_all()
+        failed = 0
+        changed = defaultdict(list)
+        with ProcessPoolExecutor(max_workers=options['workers'], initializer=django.setup) as pool:
+            futures = {
+                pool.submit(process_image, name, variants=name in needs_variants): name
+                for name in pending
+            }
+            for future in as_completed(futures):
+                name = futures[future]
+                try:
+                    fields = image_fields(name, future.result())
+                except Exception as e:
+                    failed += 1
+                    self.stderr.write(f"{name}: {e}")
+                    continue
+                for item in pending[name]:
+                    for field_name, value in fields.items():
+                        setattr(item, field_name, value)
+                    changed[type(item)].append(item)
+
+        for model, items in changed.items():
+            model.objects.bulk_update(items, IMAGE_FIELDS[2:], batch_size=500)
+        # Cached shelves and pages pick up the new image attributes
+        bump_catalog_version()
+        self.stdout.write(self.style.SUCCESS(
+            f"Processed {len(pending) - failed} images ({len(needs_variants)} needed variants, {failed} failed)"
+        ))
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from homepage.recommendations import ORDER_BATCH_SIZE, TOP_K, build_recommendations
+
+
+class Command(BaseCommand):
+    help = "Incrementally build co-purchase book recommendations from order history"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--top-k', type=int, default=TOP_K, help="Recommendations kept per book")
+        parser.add_argument('--batch-size', type=int, default=ORDER_BATCH_SIZE, help="Orders counted per batch")
+        parser.add_argument('--full', action='store_true', help="Discard previous counts and rebuild from every order")
+
+    def handle(self, *args, **options):
+        run = build_recommendations(
+            top_k=options['top_k'],
+            batch_size=options['batch_size'],
+            full=options['full'],
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"Processed {run.orders_processed} orders (up to order #{run.last_order_id})"
+        ))
@@ -0,0 +1,40 @@
+import json
+import shutil
+import subprocess
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from homepage.videos import MANIFEST_NAME, build_renditions, rendition_dir
+
+
+class Command(BaseCommand):
+    help = "Generate poster frames and smaller H.264 renditions of the homepage promo videos (needs ffmpeg)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('names', nargs='*', help="Video file names; defaults to every .mp4 in PROMO_VIDEO_DIR")
+        parser.add_argument('--force', action='store_true', help="Rebuild videos whose renditions are up to date")
+
+    def handle(self, *args, **options):
+        if not shutil.which(settings.FFMPEG_BINARY):
+            raise CommandError(f"ffmpeg not found ({settings.FFMPEG_BINARY}); set FFMPEG_BINARY")
+
+        source_dir = Path(settings.PROMO_VIDEO_DIR)
+        sources = [source_dir / name for name in options['names']] or sorted(source_dir.glob('*.mp4'))
+        for source in sources:
+            if not source.is_file():
+                self.stderr.write(f"{source.name}: not found")
+                continue
+            manifest_path = Path(settings.MEDIA_ROOT) / rendition_dir(source.name) / MANIFEST_NAME
+            if not options['force'] and manifest_path.exists():
+                if json.loads(manifest_path.read_text()).get('source_mtime') == source.stat().st_mtime:
+                    self.stdout.write(f"{source.name}: up to date")
+                    continue
+            try:
+                manifest = build_renditions(source)
+            except subprocess.CalledProcessError as e:
+                self.stderr.write(f"{source.name}: ffmpeg failed: {e.stderr.decode(errors='replace').strip()}")
+                continue
+            summary = ', '.join(f"{r['height']}p {r['bytes'] // 1024} KiB" for r in manifest['renditions'])
+            self.stdout.write(self.style.SUCCESS(f"{source.name}: {summary}"))
@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from homepage.catalog_import import IMPORT_BATCH_SIZE, import_catalog, read_rows
+from homepage.models import Book
+from product_categories.models import Product
+
+MODELS = {'book': Book, 'product': Product}
+
+
+class Command(BaseCommand):
+    help = (
+        "Bulk-import Books or Products from a CSV (with header) or JSON Lines file. "
+        "Columns: title, category, price, old_price, on_sale, description, image. "
+        "category is a Book category code (e.g. hindi) or a product_variety type (e.g. HIN)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="CSV or .jsonl file")
+        parser.add_argument('--model', choices=sorted(MODELS), default='book')
+        parser.add_argument('--format', choices=('csv', 'jsonl'), help="Defaults to the file extension")
+        parser.add_argument('--batch-size', type=int, default=IMPORT_BATCH_SIZE, help="Rows per bulk insert")
+
+    def handle(self, *args, **options):
+        try:
+            rows = read_rows(options['path'], options['format'])
+            result = import_catalog(rows, MODELS[options['model']], batch_size=options['batch_size'])
+        except (OSError, UnicodeDecodeError) as e:
+            raise CommandError(f"Could not read {options['path']}: {e}")
+
+        for line_number, message in result.errors:
+            self.stderr.write(f"Line {line_number}: {message}")
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {result.created} {options['model']}s ({len(result.errors)} rows skipped)"
+        ))
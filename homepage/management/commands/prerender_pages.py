@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.template import TemplateDoesNotExist
+
+from demo.prerender import PRERENDERED_PAGES, page_path, prerender_page
+
+
+class Command(BaseCommand):
+    help = (
+        "Render the static content pages to compressed HTML files in PRERENDER_ROOT. "
+        "Run on every deploy, after collectstatic so the pages link the current assets."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('names', nargs='*', help=f"URL names; defaults to {', '.join(PRERENDERED_PAGES)}")
+        parser.add_argument('--clear', action='store_true', help="Delete the files instead, so the views render live again")
+
+    def handle(self, *args, **options):
+        names = options['names'] or PRERENDERED_PAGES
+        unknown = set(names) - set(PRERENDERED_PAGES)
+        if unknown:
+            raise CommandError(f"Not a prerendered page: {', '.join(sorted(unknown))}")
+
+        for name in names:
+            path = page_path(name)
+            if options['clear']:
+                # Plain file first: it is what switches serving on
+                for suffix in ('', '.gz', '.br'):
+                    path.with_name(path.name + suffix).unlink(missing_ok=True)
+                self.stdout.write(f"{name}: cleared")
+                continue
+            try:
+                size = prerender_page(name)
+            except (TemplateDoesNotExist, ValueError) as e:
+                self.stderr.write(f"{name}: skipped ({e}); served live")
+                continue
+            self.stdout.write(self.style.SUCCESS(f"{name}: {size // 1024} KiB -> {path}"))
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from demo.prerender import refresh_prerendered
+from homepage.cache import bump_catalog_version
+from homepage.category_stats import rebuild_category_stats
+from homepage.models import CategoryStats
+
+
+class Command(BaseCommand):
+    help = "Recompute the per-category counts and price ranges (CategoryStats) from the Book and Product tables"
+
+    def handle(self, *args, **options):
+        rebuild_category_stats()
+        bump_catalog_version()
+        refresh_prerendered('productcatagory')
+        for row in CategoryStats.objects.order_by('catalog', 'category'):
+            prices = f"{row.min_price} - {row.max_price}" if row.total else '-'
+            self.stdout.write(f"{row.catalog:<8} {row.category:<24} {row.total:>6} ({row.on_sale} on sale)  {prices}")
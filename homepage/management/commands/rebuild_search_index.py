@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from demo.search import get_backend
+
+
+class Command(BaseCommand):
+    help = "Re-index every Book and Product in the configured search backend"
+
+    def handle(self, *args, **options):
+        backend = get_backend()
+        count = backend.rebuild()
+        self.stdout.write(self.style.SUCCESS(f"{type(backend).__name__}: indexed {count} items"))
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from demo.search import get_backend
+from homepage.cache import bump_catalog_version
+from homepage.catalog import rebuild_catalog
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the CatalogItem read table from every Book and Product, then re-index "
+        "it in the search backend. Use after changing Books or Products behind the ORM's back."
+    )
+
+    def handle(self, *args, **options):
+        count = rebuild_catalog()
+        bump_catalog_version()
+        indexed = get_backend().rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {count} catalog items; indexed {indexed}"))
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.8 on 2026-10-17 01:38
+
+import django.contrib.postgres.search
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+def create_search_indexes(apps, schema_editor):
+    # GIN indexes only exist on PostgreSQL; other backends keep plain substring search
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(
+        "CREATE INDEX IF NOT EXISTS homepage_book_search_vector_gin ON homepage_book USING gin (search_vector)"
+    )
+    schema_editor.execute(
+        "CREATE INDEX IF NOT EXISTS homepage_book_title_trgm ON homepage_book USING gin (title gin_trgm_ops)"
+    )
+
+
+def drop_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute("DROP INDEX IF EXISTS homepage_book_search_vector_gin")
+    schema_editor.execute("DROP INDEX IF EXISTS homepage_book_title_trgm")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('homepage', '0002_recommendationrun_bookrecommendation_copurchase'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name='book',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.8 on 2026-10-17 01:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('homepage', '0003_book_search_vector'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='book',
+            name='search_key',
+            field=models.CharField(blank=True, default='', editable=False, max_length=255),
+        ),
+        migrations.AddIndex(
+            model_name='book',
+            index=models.Index(fields=['search_key'], name='book_search_key_prefix', opclasses=['varchar_pattern_ops']),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-17 01:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('homepage', '0004_book_search_key_book_book_search_key_prefix'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='book',
+            name='image_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.8 on 2026-10-17 02:02
+
+from django.db import migrations, models
+
+
+def copy_date_added(apps, schema_editor):
+    # Existing rows would otherwise all claim to have changed at migration time
+    Book = apps.get_model('homepage', 'Book')
+    Book.objects.update(updated_at=models.F('date_added'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('homepage', '0006_book_image_height_book_image_placeholder_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='book',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.RunPython(copy_date_added, migrations.RunPython.noop),
+    ]
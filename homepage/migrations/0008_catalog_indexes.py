@@ -0,0 +1,25 @@
+# Generated by Django 5.2.8 on 2026-10-17 02:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('homepage', '0007_book_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='book',
+            index=models.Index(fields=['category', 'title', 'id'], name='book_category_title'),
+        ),
+        migrations.AddIndex(
+            model_name='book',
+            index=models.Index(condition=models.Q(('on_sale', True)), fields=['category', 'title', 'id'], name='book_sale_category_title'),
+        ),
+        migrations.AddIndex(
+            model_name='book',
+            index=models.Index(fields=['-date_added'], name='book_date_added_desc'),
+        ),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 5.2.8 on 2026-10-17 02:07
+
+from django.db import migrations, models
+from django.db.models import Count, Max, Min, Q
+
+
+def populate(apps, schema_editor):
+    Book = apps.get_model('homepage', 'Book')
+    Product = apps.get_model('product_categories', 'Product')
+    CategoryStats = apps.get_model('homepage', 'CategoryStats')
+    aggregates = {
+        'total': Count('id'),
+        'on_sale': Count('id', filter=Q(on_sale=True)),
+        'min_price': Min('price'),
+        'max_price': Max('price'),
+    }
+    rows = []
+    for catalog, model, field in (('book', Book, 'category'), ('product', Product, 'category__type')):
+        for row in model.objects.values(field).annotate(**aggregates).order_by():
+            code = row.pop(field)
+            rows.append(CategoryStats(catalog=catalog, category=code, **row))
+    CategoryStats.objects.bulk_create(rows)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('homepage', '0008_catalog_indexes'),
+        ('product_categories', '0008_catalog_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CategoryStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('catalog', models.CharField(choices=[('book', 'Book'), ('product', 'Product')], max_length=10)),
+                ('category', models.CharField(max_length=30)),
+                ('total', models.PositiveIntegerField(default=0)),
+                ('on_sale', models.PositiveIntegerField(default=0)),
+                ('min_price', models.DecimalField(blank=True, decimal_places=2, max_digits=6, null=True)),
+                ('max_price', models.DecimalField(blank=True, decimal_places=2, max_digits=6, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('catalog', 'category'), name='unique_category_stats')],
+            },
+        ),
+        migrations.RunPython(populate, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,104 @@
+# Generated by Django 5.2.8 on 2026-10-17 02:12
+
+import django.contrib.postgres.search
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations, models
+
+COPIED_FIELDS = (
+    'title', 'slug', 'price', 'old_price', 'on_sale', 'search_key',
+    'image', 'image_variants', 'image_width', 'image_height', 'image_placeholder',
+)
+
+
+def populate(apps, schema_editor):
+    Book = apps.get_model('homepage', 'Book')
+    Product = apps.get_model('product_categories', 'Product')
+    CatalogItem = apps.get_model('homepage', 'CatalogItem')
+    items = []
+    for book in Book.objects.iterator():
+        items.append(CatalogItem(
+            kind=0, item_id=book.id, category=book.category, category_label=book.get_category_display(),
+            **{name: getattr(book, name) for name in COPIED_FIELDS},
+        ))
+    for product in Product.objects.select_related('category').iterator():
+        items.append(CatalogItem(
+            kind=1, item_id=product.id, category=product.category.type, category_label=product.category.name,
+            **{name: getattr(product, name) for name in COPIED_FIELDS},
+        ))
+    CatalogItem.objects.bulk_create(items, batch_size=1000)
+    if schema_editor.connection.vendor == 'postgresql':
+        CatalogItem.objects.update(search_vector=(
+            SearchVector('title', weight='A', config='english')
+            + SearchVector('category_label', weight='B', config='english')
+        ))
+
+
+def create_search_indexes(apps, schema_editor):
+    # GIN indexes only exist on PostgreSQL; the per-model ones go with the search_vector columns
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute("DROP INDEX IF EXISTS homepage_book_title_trgm")
+    schema_editor.execute("DROP INDEX IF EXISTS product_categories_product_title_trgm")
+    schema_editor.execute(
+        "CREATE INDEX IF NOT EXISTS homepage_catalogitem_search_vector_gin ON homepage_catalogitem USING gin (search_vector)"
+    )
+    schema_editor.execute(
+        "CREATE INDEX IF NOT EXISTS homepage_catalogitem_title_trgm ON homepage_catalogitem USING gin (title gin_trgm_ops)"
+    )
+
+
+def drop_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute("DROP INDEX IF EXISTS homepage_catalogitem_search_vector_gin")
+    schema_editor.execute("DROP INDEX IF EXISTS homepage_catalogitem_title_trgm")
+    schema_editor.execute(
+        "CREATE INDEX IF NOT EXISTS homepage_book_title_trgm ON homepage_book USING gin (title gin_trgm_ops)"
+    )
+    schema_editor.execute(
+        "CREATE INDEX IF NOT EXISTS product_categories_product_title_trgm ON product_categories_product USING gin (title gin_trgm_ops)"
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('homepage', '0009_categorystats'),
+        ('product_categories', '0008_catalog_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CatalogItem',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.PositiveSmallIntegerField(choices=[(0, 'Book'), (1, 'Product')])),
+                ('item_id', models.PositiveBigIntegerField()),
+                ('title', models.CharField(max_length=200)),
+                ('slug', models.SlugField(db_index=False, max_length=200)),
+                ('category', models.CharField(max_length=30)),
+                ('category_label', models.CharField(max_length=100)),
+                ('price', models.DecimalField(decimal_places=2, max_digits=6)),
+                ('old_price', models.DecimalField(blank=True, decimal_places=2, max_digits=6, null=True)),
+                ('on_sale', models.BooleanField(default=False)),
+                ('image', models.ImageField(blank=True, null=True, upload_to='')),
+                ('image_variants', models.JSONField(blank=True, default=dict)),
+                ('image_width', models.PositiveIntegerField(blank=True, null=True)),
+                ('image_height', models.PositiveIntegerField(blank=True, null=True)),
+                ('image_placeholder', models.CharField(blank=True, default='', max_length=7)),
+                ('search_key', models.CharField(blank=True, default='', max_length=255)),
+                ('search_vector', django.contrib.postgres.search.SearchVectorField(editable=False, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['search_key'], name='catalog_search_key_prefix', opclasses=['varchar_pattern_ops'])],
+                'constraints': [models.UniqueConstraint(fields=('kind', 'item_id'), name='unique_catalog_item')],
+            },
+        ),
+        migrations.RunPython(populate, migrations.RunPython.noop),
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+        migrations.RemoveField(
+            model_name='book',
+            name='search_vector',
+        ),
+    ]
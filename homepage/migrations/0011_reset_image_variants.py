@@ -0,0 +1,23 @@
+# Generated by Django 5.2.8 on 2026-10-17 03:05
+
+from django.db import migrations
+
+
+def reset_image_variants(apps, schema_editor):
+    # Variant file names now keep the source extension (homepage.images.variant_name);
+    # forget the old ones so pages fall back to the original image until
+    # build_image_variants writes the new copies
+    for app_label, model_name in (('homepage', 'Book'), ('product_categories', 'Product'), ('homepage', 'CatalogItem')):
+        apps.get_model(app_label, model_name).objects.exclude(image_variants={}).update(image_variants={})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('homepage', '0010_catalogitem'),
+        ('product_categories', '0009_remove_product_search_vector'),
+    ]
+
+    operations = [
+        migrations.RunPython(reset_image_variants, migrations.RunPython.noop),
+    ]
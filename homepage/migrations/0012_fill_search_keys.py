@@ -0,0 +1,32 @@
+# Generated by Django 5.2.8 on 2026-10-17 04:10
+
+from django.db import migrations
+
+from homepage.search_keys import search_key
+
+
+def fill_search_keys(apps, schema_editor):
+    # search_key was added empty (homepage 0004, product_categories 0005) and only
+    # save() fills it, so rows that existed before then, and the CatalogItems
+    # copied from them, cannot be found by autocomplete or BM25 search
+    for app_label, model_name in (('homepage', 'Book'), ('product_categories', 'Product'), ('homepage', 'CatalogItem')):
+        model = apps.get_model(app_label, model_name)
+        changed = []
+        for row in model.objects.only('id', 'title', 'search_key').iterator(chunk_size=1000):
+            key = search_key(row.title)
+            if row.search_key != key:
+                row.search_key = key
+                changed.append(row)
+        model.objects.bulk_update(changed, ['search_key'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('homepage', '0011_reset_image_variants'),
+        ('product_categories', '0009_remove_product_search_vector'),
+    ]
+
+    operations = [
+        migrations.RunPython(fill_search_keys, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.8 on 2026-10-17 04:25
+
+import django.utils.timezone
+from django.db import migrations, models
+from django.db.models import Max
+
+
+def create_revision(apps, schema_editor):
+    CatalogItem = apps.get_model('homepage', 'CatalogItem')
+    CatalogRevision = apps.get_model('homepage', 'CatalogRevision')
+    latest = CatalogItem.objects.aggregate(latest=Max('updated_at'))['latest']
+    CatalogRevision.objects.create(id=1, number=1, changed_at=latest or django.utils.timezone.now())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('homepage', '0012_fill_search_keys'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CatalogRevision',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('number', models.BigIntegerField(default=0)),
+                ('changed_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+        migrations.RunPython(create_revision, migrations.RunPython.noop),
+    ]
@@ -1,9 +1,45 @@
 # homepage/models.py
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 from django.utils import timezone
 from django.urls import reverse
-from django.utils.text import slugify
-import re
+
+from .search_keys import search_key
+from .slugs import unique_slug
+
+class CatalogSourceQuerySet(models.QuerySet):
+    """
+    QuerySet of Book and Product. bulk_create(), bulk_update() and update() skip
+    save() and the model signals, so they bring the CatalogItems of the rows they
+    wrote, and the search backend, up to date themselves. The caller bumps the
+    catalog version (homepage.cache) once it is done writing.
+    """
+
+    def _sync_catalog(self, ids):
+        # Imported here: homepage.catalog and demo.search import these models
+        from demo.search import get_backend
+        from .catalog import sync_catalog_items
+
+        if ids:
+            get_backend().index_many(sync_catalog_items(self.model, ids))
+
+    def bulk_create(self, objs, *args, **kwargs):
+        created = super().bulk_create(objs, *args, **kwargs)
+        self._sync_catalog([obj.pk for obj in created if obj.pk is not None])
+        return created
+
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        objs = list(objs)
+        rows = super().bulk_update(objs, fields, *args, **kwargs)
+        self._sync_catalog([obj.pk for obj in objs])
+        return rows
+
+    def update(self, **kwargs):
+        ids = list(self.values_list('pk', flat=True))
+        rows = super().update(**kwargs)
+        self._sync_catalog(ids)
+        return rows
+
 
 class Book(models.Model):
     CATEGORY_CHOICES = [
@@ -25,21 +61,28 @@ class Book(models.Model):
     on_sale = models.BooleanField(default=False)
     image = models.ImageField(upload_to='books/', blank=True, null=True)
     date_added = models.DateTimeField(auto_now_add=True)
+    # Time of the last edit, shown in the admin
+    updated_at = models.DateTimeField(auto_now=True)
     description = models.TextField(blank=True, null=True)
+    # Normalized, transliterated title for indexed prefix matching (see homepage.search_keys)
+    search_key = models.CharField(max_length=255, blank=True, default='', editable=False)
+    # {'source': image name, 'widths': [...]} of the resized copies (see homepage.images)
+    image_variants = models.JSONField(default=dict, blank=True, editable=False)
+    # Intrinsic size and dominant colour of the image, so pages can reserve space and paint before it loads
+    image_width = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    image_height = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    image_placeholder = models.CharField(max_length=7, blank=True, default='', editable=False)
+
+    objects = CatalogSourceQuerySet.as_manager()
 
     def save(self, *args, **kwargs):
         if not self.slug:
-            clean_title = re.sub(r'[^\w\s-]', '', self.title)
-            clean_title = re.sub(r'\s+', ' ', clean_title).strip()
-            base_slug = slugify(clean_title)
-            
-            slug = base_slug
-            counter = 1
-            while self.__class__.objects.filter(slug=slug).exists():
-                slug = f"{base_slug}-{counter}"
-                counter += 1
-                
-            self.slug = slug
+            self.slug = unique_slug(self.__class__, self.title)
+        self.search_key = search_key(self.title)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'title' in update_fields:
+            # The key follows the title, so it must be written with it
+            kwargs['update_fields'] = {*update_fields, 'search_key'}
         super().save(*args, **kwargs)
 
     def get_absolute_url(self):
@@ -53,4 +96,155 @@ class Book(models.Model):
         return '/static/images/placeholder.png'
 
     def __str__(self):
-        return f"{self.title} ({self.get_category_display()})"
\ No newline at end of file
+        return f"{self.title} ({self.get_category_display()})"
+
+    class Meta:
+        indexes = [
+            # varchar_pattern_ops lets PostgreSQL serve LIKE 'prefix%' from the btree
+            models.Index(fields=['search_key'], name='book_search_key_prefix', opclasses=['varchar_pattern_ops']),
+            # Category pages and shelves: WHERE category = ... ORDER BY title, id (keyset pagination)
+            models.Index(fields=['category', 'title', 'id'], name='book_category_title'),
+            # Sale-only shelves; only the on-sale rows are indexed
+            models.Index(fields=['category', 'title', 'id'], name='book_sale_category_title', condition=models.Q(on_sale=True)),
+            # Admin changelist ordering
+            models.Index(fields=['-date_added'], name='book_date_added_desc'),
+        ]
+
+class CoPurchase(models.Model):
+    """One cell of the sparse book-book co-purchase matrix (stored in both directions)"""
+    book = models.ForeignKey(Book, on_delete=models.CASCADE, related_name='+')
+    other = models.ForeignKey(Book, on_delete=models.CASCADE, related_name='+')
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['book', 'other'], name='unique_copurchase_pair'),
+        ]
+
+
+class BookRecommendation(models.Model):
+    """Top-K co-purchased books for a book, read by book_detail"""
+    book = models.ForeignKey(Book, on_delete=models.CASCADE, related_name='recommendations')
+    recommended = models.ForeignKey(Book, on_delete=models.CASCADE, related_name='recommended_in')
+    score = models.PositiveIntegerField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['book', '-score']),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['book', 'recommended'], name='unique_book_recommendation'),
+        ]
+
+    def __str__(self):
+        return f"{self.book_id} -> {self.recommended_id} ({self.score})"
+
+
+class RecommendationRun(models.Model):
+    """High-water mark of the incremental build_recommendations job"""
+    last_order_id = models.BigIntegerField(default=0)
+    orders_processed = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"Run #{self.id} up to order #{self.last_order_id}"
+
+
+class CatalogRevision(models.Model):
+    """
+    The single row counting catalog changes, advanced with every catalog version
+    bump (homepage.cache) so conditional GETs (homepage.conditional) are answered
+    from one primary key lookup
+    """
+    ID = 1
+
+    number = models.BigIntegerField(default=0)
+    changed_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"Catalog revision {self.number} ({self.changed_at})"
+
+
+class CategoryStats(models.Model):
+    """Per-category totals and price range of Books and Products, kept current by homepage.category_stats"""
+    BOOK = 'book'
+    PRODUCT = 'product'
+    CATALOG_CHOICES = [(BOOK, 'Book'), (PRODUCT, 'Product')]
+
+    catalog = models.CharField(max_length=10, choices=CATALOG_CHOICES)
+    # Book.category code, or product_variety.type for Products
+    category = models.CharField(max_length=30)
+    total = models.PositiveIntegerField(default=0)
+    on_sale = models.PositiveIntegerField(default=0)
+    min_price = models.DecimalField(max_digits=6, decimal_places=2, null=True, blank=True)
+    max_price = models.DecimalField(max_digits=6, decimal_places=2, null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['catalog', 'category'], name='unique_category_stats'),
+        ]
+
+    def __str__(self):
+        return f"{self.catalog}:{self.category} ({self.total})"
+
+
+class CatalogItem(models.Model):
+    """
+    Denormalized read copy of every Book and Product, with the category label and
+    image data flattened in, so search and autocomplete read one table with one
+    query. Kept in sync by homepage.catalog; never edited directly.
+    """
+    # Books sort first when search scores tie (see demo.search.base)
+    BOOK = 0
+    PRODUCT = 1
+    KIND_CHOICES = [(BOOK, 'Book'), (PRODUCT, 'Product')]
+
+    kind = models.PositiveSmallIntegerField(choices=KIND_CHOICES)
+    # Book.id or Product.id
+    item_id = models.PositiveBigIntegerField()
+    title = models.CharField(max_length=200)
+    slug = models.SlugField(max_length=200, db_index=False)
+    # Book.category code, or product_variety.type for Products
+    category = models.CharField(max_length=30)
+    # Book.get_category_display(), or product_variety.name for Products
+    category_label = models.CharField(max_length=100)
+    price = models.DecimalField(max_digits=6, decimal_places=2)
+    old_price = models.DecimalField(max_digits=6, decimal_places=2, blank=True, null=True)
+    on_sale = models.BooleanField(default=False)
+    image = models.ImageField(blank=True, null=True)
+    image_variants = models.JSONField(default=dict, blank=True)
+    image_width = models.PositiveIntegerField(null=True, blank=True)
+    image_height = models.PositiveIntegerField(null=True, blank=True)
+    image_placeholder = models.CharField(max_length=7, blank=True, default='')
+    search_key = models.CharField(max_length=255, blank=True, default='')
+    # Filled by the PostgreSQL search backend from title and category_label
+    search_vector = SearchVectorField(null=True, editable=False)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    @property
+    def item_type(self):
+        """Cart item type ('book' or 'product')"""
+        return 'book' if self.kind == self.BOOK else 'product'
+
+    def get_absolute_url(self):
+        name = 'book_detail' if self.kind == self.BOOK else 'product_detail'
+        return reverse(name, kwargs={'slug': self.slug})
+
+    @property
+    def image_url(self):
+        """Return image URL for JavaScript"""
+        if self.image:
+            return self.image.url
+        return '/static/images/placeholder.png'
+
+    def __str__(self):
+        return f"{self.title} ({self.category_label})"
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['kind', 'item_id'], name='unique_catalog_item'),
+        ]
+        indexes = [
+            models.Index(fields=['search_key'], name='catalog_search_key_prefix', opclasses=['varchar_pattern_ops']),
+        ]
@@ -0,0 +1,95 @@
+# homepage/page_cache.py
+from django.conf import settings
+from django.core.cache import cache
+from django.http import Http404, HttpResponse
+from django.shortcuts import get_object_or_404, render
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+
+from .cache import get_catalog_version
+
+PAGE_KEY = 'page:{label}:{slug}'
+SUGGESTIONS_KEY = 'page:{label}:{slug}:suggestions'
+# Entries are dropped by the model signals; the timeout only bounds memory for pages nobody visits
+PAGE_CACHE_TIMEOUT = 24 * 60 * 60
+# Marker rendered in place of the suggestions, swapped for the current ones on every request
+SUGGESTIONS_SLOT = mark_safe('<!-- suggestions -->')
+
+
+def _keys(model, slug):
+    label = model._meta.label_lower
+    return PAGE_KEY.format(label=label, slug=slug), SUGGESTIONS_KEY.format(label=label, slug=slug)
+
+
+def _render_suggestions(books):
+    return render_to_string('includes/suggestions.html', {'suggested_books': books})
+
+
+def detail_page(request, model, slug, suggestions):
+    """
+    Serve book_detail.html for the Book/Product `slug` from two cache entries:
+
+    - the page itself, which depends only on that object and is dropped by
+      invalidate_detail_page() when it is saved or deleted;
+    - its "You might also like" block, `suggestions(instance)` rendered and
+      tagged with the catalog version, since it shows other books. Only the
+      block is re-rendered after an unrelated catalog change.
+
+    A fully cached page costs one cache round trip and no queries. The page
+    holds nothing per visitor (the cart and CSRF token come from /cart/items/),
+    so one copy serves every anonymous GET; other methods and requests with a
+    session get a fresh render.
+
+    A session is recognised by its cookie, without loading it: reading
+    request.user or request.session would make SessionMiddleware add
+    Vary: Cookie, and CacheControlMiddleware would then send the page private.
+    """
+    if request.method not in ('GET', 'HEAD') or settings.SESSION_COOKIE_NAME in request.COOKIES:
+        # Only anonymous GETs share the cached copy
+        instance = get_object_or_404(model, slug=slug)
+        return render(request, 'book_detail.html', {
+            'book': instance,
+            'suggestions_html': _render_suggestions(suggestions(instance)),
+            'model_type': 'book',
+        })
+
+    page_key, suggestions_key = _keys(model, slug)
+    version = get_catalog_version()
+    entries = cache.get_many([page_key, suggestions_key])
+    page = entries.get(page_key)
+    block = entries.get(suggestions_key)
+
+    instance = None
+    if page is None:
+        try:
+            instance = model.objects.get(slug=slug)
+        except model.DoesNotExist:
+            raise Http404(f"No {model._meta.verbose_name} matches the given query.")
+        html = render_to_string('book_detail.html', {
+            'book': instance,
+            'suggestions_html': SUGGESTIONS_SLOT,
+            'model_type': 'book',
+        }, request=request)
+        page = {'pk': instance.pk, 'html': html}
+        cache.set(page_key, page, PAGE_CACHE_TIMEOUT)
+
+    if block is None or block['version'] != version:
+        if instance is None:
+            try:
+                instance = model.objects.get(pk=page['pk'])
+            except model.DoesNotExist:
+                # Deleted since the page was cached, before its signal reached this cache
+                raise Http404(f"No {model._meta.verbose_name} matches the given query.")
+        block = {'version': version, 'html': _render_suggestions(suggestions(instance))}
+        cache.set(suggestions_key, block, PAGE_CACHE_TIMEOUT)
+
+    return HttpResponse(page['html'].replace(SUGGESTIONS_SLOT, block['html'], 1))
+
+
+def invalidate_detail_page(instance):
+    """
+    Drop the cached page of one Book/Product (called from its save/delete
+    signals), under its old slug too if the save renamed it
+    """
+    slugs = {instance.slug, getattr(instance, '_previous_slug', None)} - {None}
+    cache.delete_many([key for slug in slugs for key in _keys(type(instance), slug)])
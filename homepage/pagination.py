@@ -0,0 +1,58 @@
+# homepage/pagination.py
+import base64
+import json
+
+from django.db.models import Q
+
+PAGE_SIZE = 20
+
+
+def dump_cursor(values):
+    """Encode a list of JSON-serializable sort-key values into an opaque URL-safe token"""
+    raw = json.dumps(values, ensure_ascii=False, separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def load_cursor(cursor):
+    """Decode a token from dump_cursor(); raises ValueError if it is not one"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')).decode('utf-8'))
+    except Exception:
+        raise ValueError("Invalid cursor")
+    if not isinstance(values, list):
+        raise ValueError("Invalid cursor")
+    return values
+
+
+def encode_cursor(title, pk):
+    """Encode the (title, id) of the last row shown into an opaque URL-safe token"""
+    return dump_cursor([title, pk])
+
+
+def decode_cursor(cursor):
+    """Decode a token from encode_cursor(); raises ValueError if it was tampered with"""
+    values = load_cursor(cursor)
+    if len(values) != 2 or not isinstance(values[0], str) or not isinstance(values[1], int):
+        raise ValueError("Invalid cursor")
+    return values[0], values[1]
+
+
+def keyset_page(queryset, cursor=None, page_size=PAGE_SIZE):
+    """
+    Return (rows, next_cursor) for the page after `cursor`, ordered by (title, id).
+    Seeks past the cursor instead of using OFFSET, and fetches one extra row
+    to detect the next page instead of running COUNT(*).
+    """
+    queryset = queryset.order_by('title', 'id')
+    if cursor:
+        title, pk = decode_cursor(cursor)
+        queryset = queryset.filter(Q(title__gt=title) | Q(title=title, id__gt=pk))
+
+    rows = list(queryset[:page_size + 1])
+    if len(rows) <= page_size:
+        return rows, None
+
+    rows = rows[:page_size]
+    last = rows[-1]
+    return rows, encode_cursor(last.title, last.id)
@@ -0,0 +1,146 @@
+# homepage/recommendations.py
+import logging
+from collections import Counter, defaultdict
+from datetime import timedelta
+from itertools import combinations, groupby
+
+from django.db import transaction
+from django.utils import timezone
+
+from user.models import Order, OrderItem
+
+from .models import Book, BookRecommendation, CoPurchase, RecommendationRun
+
+logger = logging.getLogger(__name__)
+
+TOP_K = 10
+ORDER_BATCH_SIZE = 2000
+COUNTED_STATUSES = ('processing', 'shipped')
+# Pending orders older than this are treated as abandoned and no longer hold back the watermark
+PENDING_GRACE = timedelta(days=1)
+
+
+def _watermark(last_order_id):
+    """
+    Highest order id that is safe to process.
+    Stops just before the oldest order that may still turn into a real purchase.
+    """
+    blocking = (
+        Order.objects.filter(
+            id__gt=last_order_id,
+            status='pending_payment',
+            created_at__gte=timezone.now() - PENDING_GRACE,
+        )
+        .order_by('id')
+        .values_list('id', flat=True)
+        .first()
+    )
+    if blocking is not None:
+        return blocking - 1
+    return Order.objects.order_by('-id').values_list('id', flat=True).first() or last_order_id
+
+
+def _count_pairs(order_ids):
+    """Count co-purchased book pairs (both directions) for a batch of orders"""
+    rows = (
+        OrderItem.objects.filter(order_id__in=order_ids, item_type='book')
+        .order_by('order_id')
+        .values_list('order_id', 'item_id')
+    )
+    pairs = Counter()
+    for _, items in groupby(rows, key=lambda row: row[0]):
+        book_ids = sorted({item_id for _, item_id in items})
+        for a, b in combinations(book_ids, 2):
+            pairs[a, b] += 1
+            pairs[b, a] += 1
+    return pairs
+
+
+def _apply_pairs(pairs):
+    """Add batch counts to CoPurchase and return the ids of the books whose row changed"""
+    live_ids = set(Book.objects.filter(
+        id__in={a for a, _ in pairs} | {b for _, b in pairs}
+    ).values_list('id', flat=True))
+    pairs = {(a, b): n for (a, b), n in pairs.items() if a in live_ids and b in live_ids}
+    if not pairs:
+        return set()
+
+    touched = {a for a, _ in pairs}
+    existing = {
+        (row.book_id, row.other_id): row
+        for row in CoPurchase.objects.filter(book_id__in=touched)
+    }
+
+    to_update, to_create = [], []
+    for (a, b), n in pairs.items():
+        row = existing.get((a, b))
+        if row is None:
+            to_create.append(CoPurchase(book_id=a, other_id=b, count=n))
+        else:
+            row.count += n
+            to_update.append(row)
+
+    CoPurchase.objects.bulk_update(to_update, ['count'], batch_size=1000)
+    CoPurchase.objects.bulk_create(to_create, batch_size=1000)
+    return touched
+
+
+def _refresh_recommendations(book_ids, top_k):
+    """Rewrite the top-K rows for each given book from its CoPurchase row"""
+    neighbours = defaultdict(list)
+    rows = CoPurchase.objects.filter(book_id__in=book_ids).values_list('book_id', 'other_id', 'count')
+    for book_id, other_id, count in rows:
+        neighbours[book_id].append((count, other_id))
+
+    recommendations = []
+    for book_id, scored in neighbours.items():
+        scored.sort(key=lambda pair: (-pair[0], pair[1]))
+        recommendations.extend(
+            BookRecommendation(book_id=book_id, recommended_id=other_id, score=count)
+            for count, other_id in scored[:top_k]
+        )
+
+    BookRecommendation.objects.filter(book_id__in=book_ids).delete()
+    BookRecommendation.objects.bulk_create(recommendations, batch_size=1000)
+
+
+def build_recommendations(top_k=TOP_K, batch_size=ORDER_BATCH_SIZE, full=False):
+    """
+    Fold orders placed since the last run into the co-purchase matrix and
+    refresh the top-K recommendations of every book they touched.
+    Returns the RecommendationRun recorded for this pass.
+    """
+    with transaction.atomic():
+        if full:
+            CoPurchase.objects.all().delete()
+            BookRecommendation.objects.all().delete()
+            RecommendationRun.objects.all().delete()
+
+        last_run = RecommendationRun.objects.select_for_update().order_by('-id').first()
+        last_order_id = last_run.last_order_id if last_run else 0
+        watermark = _watermark(last_order_id)
+
+        order_ids = list(
+            Order.objects.filter(
+                id__gt=last_order_id, id__lte=watermark, status__in=COUNTED_STATUSES,
+            ).order_by('id').values_list('id', flat=True)
+        )
+
+        touched = set()
+        for start in range(0, len(order_ids), batch_size):
+            batch = order_ids[start:start + batch_size]
+            touched |= _apply_pairs(_count_pairs(batch))
+
+        if touched:
+            _refresh_recommendations(touched, top_k)
+
+        run = RecommendationRun.objects.create(
+            last_order_id=max(watermark, last_order_id),
+            orders_processed=len(order_ids),
+        )
+
+    logger.info(
+        f"Recommendations: {len(order_ids)} orders processed, "
+        f"{len(touched)} books refreshed, watermark #{run.last_order_id}"
+    )
+    return run
@@ -0,0 +1,101 @@
+# homepage/search_keys.py
+import re
+import unicodedata
+
+# Devanagari -> Latin, close to how customers type Hindi titles (गोदान -> godan)
+DEVANAGARI_VOWELS = {
+    'अ': 'a', 'आ': 'a', 'इ': 'i', 'ई': 'i', 'उ': 'u', 'ऊ': 'u', 'ऋ': 'ri',
+    'ए': 'e', 'ऐ': 'ai', 'ओ': 'o', 'औ': 'au', 'ऑ': 'o',
+}
+DEVANAGARI_CONSONANTS = {
+    'क': 'k', 'ख': 'kh', 'ग': 'g', 'घ': 'gh', 'ङ': 'n',
+    'च': 'ch', 'छ': 'chh', 'ज': 'j', 'झ': 'jh', 'ञ': 'n',
+    'ट': 't', 'ठ': 'th', 'ड': 'd', 'ढ': 'dh', 'ण': 'n',
+    'त': 't', 'थ': 'th', 'द': 'd', 'ध': 'dh', 'न': 'n',
+    'प': 'p', 'फ': 'ph', 'ब': 'b', 'भ': 'bh', 'म': 'm',
+    'य': 'y', 'र': 'r', 'ल': 'l', 'व': 'v',
+    'श': 'sh', 'ष': 'sh', 'स': 's', 'ह': 'h',
+}
+# Consonant + nukta (क़, ज़, ड़ ...) after NFD decomposition
+DEVANAGARI_NUKTA_CONSONANTS = {'क': 'q', 'ख': 'kh', 'ग': 'g', 'ज': 'z', 'ड': 'r', 'ढ': 'rh', 'फ': 'f', 'य': 'y'}
+DEVANAGARI_MATRAS = {
+    'ा': 'a', 'ि': 'i', 'ी': 'i', 'ु': 'u', 'ू': 'u', 'ृ': 'ri',
+    'े': 'e', 'ै': 'ai', 'ो': 'o', 'ौ': 'au', 'ॉ': 'o',
+}
+DEVANAGARI_SIGNS = {'ं': 'n', 'ँ': 'n', 'ः': 'h'}
+DEVANAGARI_DIGITS = {chr(0x0966 + i): str(i) for i in range(10)}
+VIRAMA = '्'
+NUKTA = '़'
+DEVANAGARI_WORD = re.compile(r'[ऀ-ॣॱ-ॿ]+')
+
+
+def _syllables(word):
+    """
+    Split one Devanagari word into [consonants, vowel, inherent, signs] syllables;
+    `inherent` marks the implicit 'a' that schwa deletion may drop.
+    """
+    syllables = []
+    half = ''  # consonants joined by a virama onto the next syllable
+    last_consonant = None
+    for char in word:
+        if char in DEVANAGARI_CONSONANTS:
+            syllables.append([half + DEVANAGARI_CONSONANTS[char], 'a', True, ''])
+            half = ''
+            last_consonant = char
+            continue
+        if char == NUKTA and last_consonant in DEVANAGARI_NUKTA_CONSONANTS:
+            base = DEVANAGARI_CONSONANTS[last_consonant]
+            syllables[-1][0] = syllables[-1][0][:-len(base)] + DEVANAGARI_NUKTA_CONSONANTS[last_consonant]
+            continue
+        last_consonant = None
+        if char == VIRAMA and syllables and syllables[-1][2]:
+            half = syllables.pop()[0]
+        elif char in DEVANAGARI_MATRAS and syllables and syllables[-1][2]:
+            syllables[-1][1:3] = [DEVANAGARI_MATRAS[char], False]
+        elif char in DEVANAGARI_VOWELS:
+            syllables.append(['', DEVANAGARI_VOWELS[char], False, ''])
+        elif char in DEVANAGARI_SIGNS and syllables:
+            syllables[-1][2] = False
+            syllables[-1][3] += DEVANAGARI_SIGNS[char]
+    if half:
+        # Word ends in a half consonant
+        syllables.append([half, '', False, ''])
+    return syllables
+
+
+def _romanize_word(word):
+    syllables = _syllables(word)
+    # Schwa deletion: no 'a' at the end of a word, nor between two vowel-bearing syllables (right to left)
+    if syllables and syllables[-1][2]:
+        syllables[-1][1] = ''
+    for i in range(len(syllables) - 2, 0, -1):
+        if syllables[i][2] and syllables[i + 1][1] and syllables[i - 1][1]:
+            syllables[i][1] = ''
+    return ''.join(consonants + vowel + signs for consonants, vowel, _, signs in syllables)
+
+
+def transliterate_devanagari(text):
+    """Romanize Devanagari words (गोदान -> godan, प्रेमचंद -> premchand); other text passes through"""
+    text = unicodedata.normalize('NFD', text)
+    for digit, latin in DEVANAGARI_DIGITS.items():
+        text = text.replace(digit, latin)
+    text = text.replace('ॐ', 'om')
+    return DEVANAGARI_WORD.sub(lambda match: _romanize_word(match.group()), text)
+
+
+def normalize(text):
+    """
+    Reduce text to its search form: Devanagari transliterated, accents folded,
+    lowercased, punctuation dropped, whitespace collapsed.
+    """
+    text = transliterate_devanagari(text or '')
+    text = ''.join(
+        char for char in unicodedata.normalize('NFKD', text)
+        if not unicodedata.combining(char)
+    )
+    return ' '.join(re.sub(r'[^\w\s]', ' ', text.casefold()).split())
+
+
+def search_key(title, max_length=255):
+    """The value stored in Book.search_key / Product.search_key"""
+    return normalize(title)[:max_length]
@@ -0,0 +1,155 @@
+# homepage/shelves.py
+import logging
+import threading
+from dataclasses import dataclass, field
+
+from django.core.cache import cache
+from django.db import DatabaseError, close_old_connections, connection
+from django.db.models import F, Q, Window
+from django.db.models.functions import RowNumber
+from django.template.loader import render_to_string
+
+from .cache import get_catalog_version
+from .models import Book
+
+logger = logging.getLogger(__name__)
+
+# Homepage shelf order follows this map; each Book.category appears in exactly one shelf.
+CATEGORY_SLUG_MAP = {
+    'new-arrivals': {'category': 'new_arrivals', 'on_sale': False, 'name': 'NEW ARRIVALS'},
+    'manga-comics': {'category': 'manga_comics', 'on_sale': False, 'name': 'MANGA & COMICS'},
+    'most-read-combos': {'category': 'most_read_combos', 'on_sale': False, 'name': 'MOST READ COMBOS'},
+    'self-improvements': {'category': 'self_improvements', 'on_sale': True, 'name': 'SELF IMPROVEMENTS'},
+    'romance-sale': {'category': 'romance', 'on_sale': True, 'name': 'ROMANCE ON SALE'},
+    'hindi-books': {'category': 'hindi', 'on_sale': False, 'name': 'HINDI BOOKS'},
+    'business-stock-market': {'category': 'business_stock_market', 'on_sale': False, 'name': 'BUSINESS & STOCK-MARKET'},
+    'best-sellers': {'category': 'best_sellers', 'on_sale': False, 'name': 'BEST SELLERS'},
+}
+
+SHELF_SIZE = 10
+
+SHELF_FRAGMENT_KEY = 'homepage:shelf:{slug}'
+SHELF_REBUILD_LOCK_KEY = 'homepage:shelf:rebuild-lock'
+SHELF_REBUILD_LOCK_TIMEOUT = 60
+# Fragments are re-tagged on every catalog change; the timeout bounds how long a process
+# that misses a bump (no shared cache) can serve them
+SHELF_FRAGMENT_TIMEOUT = 60 * 60
+
+
+@dataclass
+class Shelf:
+    slug: str
+    name: str
+    category: str
+    on_sale: bool
+    books: list = field(default_factory=list)
+
+
+def shelf_filter(config):
+    """Return the Q object selecting the books that belong to one shelf config"""
+    q = Q(category=config['category'])
+    if config['on_sale']:
+        q &= Q(on_sale=True)
+    return q
+
+
+def shelf_books(limit=SHELF_SIZE):
+    """
+    Queryset of the first `limit` books (by title) of every homepage shelf.
+
+    Where the database allows LIMIT inside UNION ALL (PostgreSQL), each shelf
+    is its own short scan of book_category_title / book_sale_category_title,
+    so the cost stays flat as the catalog grows. Otherwise ROW_NUMBER()
+    partitioned by category ranks the shelf categories in a single pass.
+    """
+    if connection.features.supports_slicing_ordering_in_compound:
+        parts = [
+            Book.objects.filter(shelf_filter(config)).order_by('title', 'id')[:limit]
+            for config in CATEGORY_SLUG_MAP.values()
+        ]
+        return parts[0].union(*parts[1:], all=True)
+
+    combined = Q()
+    for config in CATEGORY_SLUG_MAP.values():
+        combined |= shelf_filter(config)
+    return (
+        Book.objects.filter(combined)
+        .annotate(shelf_position=Window(
+            expression=RowNumber(),
+            partition_by=[F('category')],
+            order_by=[F('title').asc(), F('id').asc()],
+        ))
+        .filter(shelf_position__lte=limit)
+        .order_by('category', 'shelf_position')
+    )
+
+
+def load_shelves(limit=SHELF_SIZE):
+    """Load the first `limit` books (by title) of every homepage shelf in one query"""
+    shelves = {}
+    for slug, config in CATEGORY_SLUG_MAP.items():
+        shelves[config['category']] = Shelf(
+            slug=slug,
+            name=config['name'],
+            category=config['category'],
+            on_sale=config['on_sale'],
+        )
+
+    for book in shelf_books(limit):
+        shelves[book.category].books.append(book)
+    for shelf in shelves.values():
+        # UNION ALL does not promise to keep each part's order
+        shelf.books.sort(key=lambda book: (book.title, book.id))
+
+    return list(shelves.values())
+
+
+def _build_shelf_fragments(version):
+    """Render every shelf to HTML and store it in the cache tagged with `version`"""
+    entries = {}
+    for position, shelf in enumerate(load_shelves(), start=1):
+        html = render_to_string('includes/shelf.html', {'shelf': shelf, 'position': position})
+        entries[SHELF_FRAGMENT_KEY.format(slug=shelf.slug)] = {'version': version, 'html': html}
+    cache.set_many(entries, timeout=SHELF_FRAGMENT_TIMEOUT)
+    return entries
+
+
+def _rebuild_in_background(version):
+    def run():
+        try:
+            _build_shelf_fragments(version)
+        except Exception as e:
+            logger.error(f"Shelf rebuild failed: {str(e)}", exc_info=True)
+        finally:
+            cache.delete(SHELF_REBUILD_LOCK_KEY)
+            close_old_connections()
+
+    threading.Thread(target=run, name='shelf-rebuild', daemon=True).start()
+
+
+def render_shelf_fragments():
+    """
+    Return the rendered HTML of every homepage shelf, in homepage order.
+
+    Fragments are tagged with the catalog version bumped by Book signals.
+    Fresh fragments cost no queries. Stale fragments are served as-is while a
+    single worker (guarded by a cache lock) rebuilds them in the background.
+    Only a cold cache renders synchronously.
+    """
+    version = get_catalog_version()
+    keys = [SHELF_FRAGMENT_KEY.format(slug=slug) for slug in CATEGORY_SLUG_MAP]
+    entries = cache.get_many(keys)
+
+    if len(entries) == len(keys):
+        if any(entry['version'] != version for entry in entries.values()):
+            if cache.add(SHELF_REBUILD_LOCK_KEY, version, timeout=SHELF_REBUILD_LOCK_TIMEOUT):
+                _rebuild_in_background(version)
+        return [entries[key]['html'] for key in keys]
+
+    try:
+        entries.update(_build_shelf_fragments(version))
+    except DatabaseError:
+        if not entries:
+            raise
+        logger.warning("Serving partial homepage shelves: database unavailable", exc_info=True)
+    return [entries[key]['html'] for key in keys if key in entries]
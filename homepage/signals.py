@@ -0,0 +1,60 @@
+# homepage/signals.py
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from demo.autocomplete import autocomplete_index
+from demo.prerender import refresh_prerendered
+from demo.search import get_backend
+
+from .cache import bump_catalog_version
+from .catalog import remove_catalog_item, sync_catalog_item
+from .category_stats import refresh_category_stats
+from .images import refresh_image_data
+from .models import Book
+from .page_cache import invalidate_detail_page
+
+
+@receiver(pre_save, sender=Book)
+def book_saving(sender, instance, **kwargs):
+    # The category the row is leaving, whose CategoryStats need refreshing too, and
+    # the slug whose cached detail page must go if this save renames it
+    previous = Book.objects.filter(pk=instance.pk).values_list('category', 'slug').first() if instance.pk else None
+    instance._previous_category, instance._previous_slug = previous or (None, None)
+
+
+@receiver(post_save, sender=Book)
+def book_saved(sender, instance, **kwargs):
+    item = sync_catalog_item(instance)
+    categories = {instance.category, getattr(instance, '_previous_category', None)}
+
+    def publish():
+        # Resizes the cover when it changed; its update() carries the result to the CatalogItem
+        refresh_image_data(instance)
+        invalidate_detail_page(instance)
+        refresh_category_stats(Book, categories)
+        version = bump_catalog_version()
+        get_backend().index(item, version)
+        autocomplete_index.update(item, version)
+        # productcatagory shows per-category book counts
+        refresh_prerendered('productcatagory')
+
+    # Once committed, so no other process rebuilds its caches or indexes from an uncommitted row
+    transaction.on_commit(publish)
+
+
+@receiver(post_delete, sender=Book)
+def book_deleted(sender, instance, **kwargs):
+    item = remove_catalog_item(instance)
+    categories = {instance.category}
+
+    def publish():
+        invalidate_detail_page(instance)
+        refresh_category_stats(Book, categories)
+        version = bump_catalog_version()
+        get_backend().remove(item, version)
+        autocomplete_index.remove(item, version)
+        # productcatagory shows per-category book counts
+        refresh_prerendered('productcatagory')
+
+    transaction.on_commit(publish)
@@ -0,0 +1,64 @@
+# homepage/slugs.py
+import re
+
+from django.db.models import Q
+from django.utils.text import slugify
+
+from .search_keys import search_key
+
+# Base for titles with nothing sluggable in them (only punctuation)
+FALLBACK_SLUG = 'item'
+
+
+def slug_base(title):
+    """Slug for a title before any -N suffix is added to make it unique"""
+    clean_title = re.sub(r'[^\w\s-]', '', title)
+    clean_title = re.sub(r'\s+', ' ', clean_title).strip()
+    # Devanagari titles slugify to nothing; fall back to their transliteration
+    return slugify(clean_title) or slugify(search_key(title)) or FALLBACK_SLUG
+
+
+def unique_slug(model, title):
+    """Allocate one slug, probing the table once per collision (single saves)"""
+    base_slug = slug_base(title)
+    slug = base_slug
+    counter = 1
+    while model.objects.filter(slug=slug).exists():
+        slug = f"{base_slug}-{counter}"
+        counter += 1
+    return slug
+
+
+def allocate_slugs(model, titles):
+    """
+    Allocate a unique slug for every title in one query.
+
+    Fetches the existing slugs starting with any of the bases (an OR of prefix
+    ranges on the slug index), keeps those that are a base or a base plus a -N
+    suffix, then hands out suffixes in memory, so titles repeated within the
+    batch get distinct slugs too. Same result as calling unique_slug() per
+    title and saving in order.
+    """
+    bases = [slug_base(title) for title in titles]
+    unique_bases = sorted(set(bases))
+    if not unique_bases:
+        return []
+    prefixes = Q()
+    for base in unique_bases:
+        prefixes |= Q(slug__startswith=base)
+    candidates = model.objects.filter(prefixes).values_list('slug', flat=True)
+    pattern = re.compile('(%s)(-[0-9]+)?' % '|'.join(re.escape(base) for base in unique_bases))
+    taken = {slug for slug in candidates if pattern.fullmatch(slug)}
+
+    next_counter = {}
+    slugs = []
+    for base in bases:
+        slug = base
+        counter = next_counter.get(base, 1)
+        while slug in taken:
+            slug = f"{base}-{counter}"
+            counter += 1
+        next_counter[base] = counter
+        taken.add(slug)
+        slugs.append(slug)
+    return slugs
@@ -0,0 +1,57 @@
+# homepage/suggestions.py
+import random
+import threading
+from array import array
+
+from .cache import get_catalog_version
+from .models import Book
+
+SUGGESTION_COUNT = 10
+
+# Per-process pool of every Book id, reloaded when the catalog version changes
+_pool = {'version': None, 'ids': array('q')}
+_pool_lock = threading.Lock()
+
+
+def _book_id_pool():
+    version = get_catalog_version()
+    if _pool['version'] != version:
+        with _pool_lock:
+            if _pool['version'] != version:
+                _pool['ids'] = array('q', Book.objects.values_list('id', flat=True).order_by())
+                _pool['version'] = version
+    return _pool['ids']
+
+
+def random_suggestions(exclude_id=None, count=SUGGESTION_COUNT):
+    """
+    Return up to `count` random books, replacing ORDER BY RANDOM().
+    Samples ids from the in-memory pool and loads just those rows with one in_bulk().
+    """
+    ids = _book_id_pool()
+    if not ids:
+        return []
+
+    picked = random.sample(ids, min(count + 1, len(ids)))
+    picked = [book_id for book_id in picked if book_id != exclude_id][:count]
+
+    books = Book.objects.in_bulk(picked)
+    return [books[book_id] for book_id in picked if book_id in books]
+
+
+def suggested_books(book, count=SUGGESTION_COUNT):
+    """
+    Books bought together with `book` (one indexed lookup on BookRecommendation),
+    topped up with random suggestions when there is not enough order history.
+    """
+    books = list(
+        Book.objects.filter(recommended_in__book_id=book.id)
+        .order_by('-recommended_in__score')[:count]
+    )
+    if len(books) < count:
+        seen = {b.id for b in books} | {book.id}
+        for extra in random_suggestions(exclude_id=book.id, count=count):
+            if extra.id not in seen and len(books) < count:
+                seen.add(extra.id)
+                books.append(extra)
+    return books
@@ -0,0 +1,32 @@
+from django import template
+
+from homepage import images
+
+register = template.Library()
+
+# Rendered width of a cover in the book grids (see .book-card in style.css)
+CARD_SIZES = "(max-width: 480px) 100vw, (max-width: 800px) 50vw, 260px"
+
+
+@register.simple_tag
+def image_srcset(item, fmt='jpeg'):
+    """srcset value for a Book/Product image; '' until its variants are built"""
+    return images.srcset(item, fmt)
+
+
+@register.inclusion_tag('includes/cover_image.html')
+def cover_image(item, sizes=CARD_SIZES, css_class='', lazy=True):
+    """
+    <picture> for a Book/Product image: WebP variants with a JPEG fallback,
+    or just the original upload when no variants exist yet. The intrinsic size
+    and placeholder colour reserve the box before the image arrives; pass
+    lazy=False for covers likely to be above the fold.
+    """
+    return {
+        'item': item,
+        'srcset': images.srcset(item),
+        'webp_srcset': images.srcset(item, 'webp'),
+        'sizes': sizes,
+        'css_class': css_class,
+        'lazy': lazy,
+    }
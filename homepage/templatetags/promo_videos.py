@@ -0,0 +1,45 @@
+from django import template
+from django.templatetags.static import static
+from django.urls import reverse
+
+from homepage.videos import load_manifest
+
+register = template.Library()
+
+# Slides show video at most ~350x200 CSS px; this height covers 1x screens
+STANDARD_HEIGHT = 360
+
+
+def _pick_sources(renditions, save_data):
+    """
+    (url, media query) pairs in <source> order: a sharper rendition for 2x
+    screens first, then the standard one. Save-Data clients get the smallest only.
+    """
+    if save_data:
+        return [(renditions[0]['url'], '')]
+    standard = next((r for r in renditions if r['height'] >= STANDARD_HEIGHT), renditions[-1])
+    sharper = next((r for r in renditions if r['height'] >= 2 * standard['height']), None)
+    sources = []
+    if sharper:
+        sources.append((sharper['url'], '(min-resolution: 2dppx)'))
+    sources.append((standard['url'], ''))
+    return sources
+
+
+@register.inclusion_tag('includes/promo_video.html', takes_context=True)
+def promo_video(context, name, poster=''):
+    """
+    <video> for a homepage promo video, using the renditions and poster built
+    by build_video_renditions when they exist and the original file otherwise.
+    `poster` is a static path used until a poster frame has been generated.
+    """
+    request = context.get('request')
+    save_data = request is not None and request.headers.get('Save-Data', '').lower() == 'on'
+    manifest = load_manifest(name)
+    if manifest:
+        sources = _pick_sources(manifest['renditions'], save_data)
+        poster_url = manifest['poster_url']
+    else:
+        sources = [(reverse('promo_video', args=[name]), '')]
+        poster_url = static(poster) if poster else ''
+    return {'sources': sources, 'poster': poster_url}
@@ -0,0 +1,29 @@
+from django import template
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.templatetags.static import static
+from django.utils.html import format_html, format_html_join
+
+register = template.Library()
+
+
+def _bundle_built(name):
+    """Whether collectstatic has written and hashed `name` (see demo.storage)"""
+    return name in getattr(staticfiles_storage, 'hashed_files', {})
+
+
+@register.simple_tag
+def static_bundle(name):
+    """
+    <link>/<script> tags for a settings.STATIC_BUNDLES entry: the single hashed
+    bundle once collected, the individual member files in DEBUG (or before the
+    first collectstatic) so they stay readable while developing.
+    """
+    if name.endswith('.css'):
+        tag = '<link rel="stylesheet" href="{}" />'
+    else:
+        tag = '<script src="{}"></script>'
+
+    if settings.DEBUG or not _bundle_built(name):
+        return format_html_join('\n    ', tag, ((static(member),) for member in settings.STATIC_BUNDLES[name]))
+    return format_html(tag, static(name))
@@ -1,3 +1,608 @@
-from django.test import TestCase
+import os
+import shutil
+import tempfile
+from io import StringIO
+from decimal import Decimal
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.core.management import call_command
+from django.core.cache import cache
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from PIL import Image
+
+from demo.autocomplete import PrefixIndex, autocomplete_index
+from demo.files import parse_range
+from demo.prerender import page_path, prerender_page
+from demo.search import get_backend
+from demo.search.bm25 import BM25SearchBackend
+from demo.search.base import make_cursor, parse_cursor
+from product_categories.models import Product, product_variety
+from user.models import Order, OrderItem
+
+from .cache import bump_catalog_version, get_catalog_version
+from .catalog_import import import_catalog
+from .conditional import CATALOG_STATE_KEY
+from .category_stats import category_stats
+from .images import variant_name
+from .models import Book, CatalogItem, CategoryStats
+from .page_cache import PAGE_KEY, SUGGESTIONS_KEY
+from .pagination import decode_cursor, dump_cursor, encode_cursor, keyset_page, load_cursor
+from .recommendations import build_recommendations
+from .search_keys import search_key
+from .shelves import CATEGORY_SLUG_MAP, load_shelves, render_shelf_fragments
+from .slugs import allocate_slugs
+from .suggestions import suggested_books
+
+
+class TempMediaMixin:
+    """Runs the tests with an empty MEDIA_ROOT holding small covers at books/cover.jpg and products/cover.jpg"""
+
+    @classmethod
+    def setUpClass(cls):
+        media_root = tempfile.mkdtemp()
+        cls.addClassCleanup(shutil.rmtree, media_root)
+        for directory in ('books', 'products'):
+            os.makedirs(os.path.join(media_root, directory))
+            Image.new('RGB', (40, 60), 'teal').save(os.path.join(media_root, directory, 'cover.jpg'))
+        cls.enterClassContext(override_settings(MEDIA_ROOT=media_root))
+        super().setUpClass()
+
+
+class CursorTests(SimpleTestCase):
+    def test_round_trip(self):
+        self.assertEqual(decode_cursor(encode_cursor("गोदान / Godan", 42)), ("गोदान / Godan", 42))
+        self.assertEqual(load_cursor(dump_cursor([1.5, 0, 3])), [1.5, 0, 3])
+
+    def test_cursor_is_url_safe(self):
+        cursor = encode_cursor("??>>~~", 1)
+        self.assertRegex(cursor, r'^[A-Za-z0-9_-]+$')
+
+    def test_rejects_tampered_cursors(self):
+        for cursor in ('not base64!', dump_cursor({'title': 'x'}), dump_cursor(['x']), dump_cursor([1, 'x'])):
+            with self.subTest(cursor=cursor):
+                with self.assertRaises(ValueError):
+                    decode_cursor(cursor)
+
+
+class KeysetPageTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        for title in ("Alpha", "Beta", "Beta", "Gamma", "Delta"):
+            Book.objects.create(title=title, category='romance', price=Decimal('100'))
+
+    def test_pages_cover_every_row_once(self):
+        seen = []
+        cursor = None
+        pages = 0
+        while True:
+            rows, cursor = keyset_page(Book.objects.all(), cursor, page_size=2)
+            seen += [(book.title, book.id) for book in rows]
+            pages += 1
+            if cursor is None:
+                break
+        self.assertEqual(pages, 3)
+        self.assertEqual(seen, list(Book.objects.order_by('title', 'id').values_list('title', 'id')))
+
+    def test_last_full_page_has_no_cursor(self):
+        rows, cursor = keyset_page(Book.objects.all(), page_size=5)
+        self.assertEqual(len(rows), 5)
+        self.assertIsNone(cursor)
+
+
+class SearchCursorTests(SimpleTestCase):
+    def test_round_trip(self):
+        self.assertIsNone(parse_cursor(''))
+        self.assertEqual(parse_cursor(make_cursor(2.25, 1, 9)), [2.25, 1, 9])
+
+    def test_rejects_tampered_cursors(self):
+        for cursor in (dump_cursor([1, 0]), dump_cursor(['1', 0, 9]), 'garbage'):
+            with self.subTest(cursor=cursor):
+                with self.assertRaises(ValueError):
+                    parse_cursor(cursor)
+
+
+class AllocateSlugsTests(TestCase):
+    def test_matches_sequential_allocation(self):
+        Book.objects.create(title="Godan", category='hindi', price=Decimal('100'))
+        Book.objects.create(title="Godan", category='hindi', price=Decimal('100'))
+        Book.objects.create(title="Godan Part Two", category='hindi', price=Decimal('100'))
+        self.assertEqual(
+            allocate_slugs(Book, ["Godan", "Godan", "Godan Part", "Nirmala"]),
+            ['godan-2', 'godan-3', 'godan-part', 'nirmala'],
+        )
+
+    def test_empty(self):
+        self.assertEqual(allocate_slugs(Book, []), [])
+
+    def test_punctuation_only_title(self):
+        Book.objects.create(title="Godan", category='hindi', price=Decimal('100'))
+        with CaptureQueriesContext(connection) as queries:
+            slugs = allocate_slugs(Book, ["?!", "..."])
+        self.assertEqual(slugs, ['item', 'item-1'])
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn("LIKE '%'", queries[0]['sql'])
+
+
+class VariantNameTests(SimpleTestCase):
+    def test_keeps_source_extension(self):
+        self.assertEqual(variant_name('books/cover.png', 480, 'webp'), 'books/variants/cover.png-480w.webp')
+        self.assertNotEqual(variant_name('books/cover.png', 480, 'jpeg'), variant_name('books/cover.jpg', 480, 'jpeg'))
+
+
+class ParseRangeTests(SimpleTestCase):
+    def test_ranges(self):
+        cases = [
+            ('bytes=0-99', (0, 99)),
+            ('bytes=100-', (100, 999)),
+            ('bytes=-100', (900, 999)),
+            ('bytes=-5000', (0, 999)),
+            ('bytes=900-5000', (900, 999)),
+            ('bytes = 0 - 0', (0, 0)),
+        ]
+        for header, expected in cases:
+            with self.subTest(header=header):
+                self.assertEqual(parse_range(header, 1000), expected)
+
+    def test_ignored(self):
+        for header in (None, '', 'bytes=-', 'items=0-1', 'bytes=0-1,5-6', 'bytes=a-b'):
+            with self.subTest(header=header):
+                self.assertIsNone(parse_range(header, 1000))
+
+    def test_unsatisfiable(self):
+        for header in ('bytes=1000-', 'bytes=5-4', 'bytes=-0'):
+            with self.subTest(header=header):
+                self.assertIs(parse_range(header, 1000), False)
+
+
+class DetailPageTests(TempMediaMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.book = Book.objects.create(title="Godan", category='hindi', price=Decimal('250'), image='books/cover.jpg')
+        variety = product_variety.objects.create(name="Bookmarks", type='NEW', image='product_categories/x.jpg')
+        cls.product = Product.objects.create(
+            category=variety, title="Bookmark", price=Decimal('40'), image='products/cover.jpg',
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def urls(self):
+        return [
+            reverse('book_detail', args=[self.book.slug]),
+            reverse('product_detail', args=[self.product.slug]),
+        ]
+
+    def assertPublic(self, response):
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('public', response['Cache-Control'])
+        self.assertIn('s-maxage=600', response['Cache-Control'])
+        self.assertNotIn('Cookie', response.get('Vary', ''))
+
+    def test_anonymous_pages_are_public_and_cached(self):
+        for url in self.urls():
+            with self.subTest(url=url):
+                self.assertPublic(self.client.get(url))
+                with self.assertNumQueries(0):
+                    self.assertPublic(self.client.get(url))
+
+    def test_session_holders_get_a_fresh_render(self):
+        self.client.cookies[settings.SESSION_COOKIE_NAME] = 'abc'
+        for url in self.urls():
+            with self.subTest(url=url):
+                self.client.get(url)
+                with CaptureQueriesContext(connection) as queries:
+                    response = self.client.get(url)
+                self.assertEqual(response.status_code, 200)
+                self.assertIn('private', response['Cache-Control'])
+                self.assertTrue(queries)
+
+
+    def test_catalog_change_rerenders_only_the_suggestions(self):
+        url = reverse('book_detail', args=[self.book.slug])
+        self.client.get(url)
+        page_key = PAGE_KEY.format(label='homepage.book', slug=self.book.slug)
+        page = cache.get(page_key)
+
+        bump_catalog_version()
+        with mock.patch('homepage.views.suggested_books', return_value=[]) as suggestions:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        suggestions.assert_called_once()
+        self.assertEqual(cache.get(page_key), page)
+        block = cache.get(SUGGESTIONS_KEY.format(label='homepage.book', slug=self.book.slug))
+        self.assertEqual(block['version'], get_catalog_version())
+
+    def test_rename_drops_the_old_page(self):
+        old_url = reverse('book_detail', args=[self.book.slug])
+        self.client.get(old_url)
+        self.book.slug = 'godan-premchand'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.book.save()
+        self.assertIsNone(cache.get(PAGE_KEY.format(label='homepage.book', slug='godan')))
+        self.assertEqual(self.client.get(old_url).status_code, 404)
+        self.assertEqual(self.client.get(reverse('book_detail', args=['godan-premchand'])).status_code, 200)
+
+class CatalogSyncTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.book = Book.objects.create(title="Godan", category='hindi', price=Decimal('250'))
+        # Current in-process indexes, so the edits below are applied to them in place
+        autocomplete_index.rebuild()
+        get_backend().rebuild()
+
+    def test_edit_reaches_catalog_search_and_autocomplete(self):
+        self.book.title = "Nirmala"
+        self.book.price = Decimal('199')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.book.save()
+
+        item = CatalogItem.objects.get(kind=CatalogItem.BOOK, item_id=self.book.id)
+        self.assertEqual((item.title, item.search_key, item.price), ("Nirmala", 'nirmala', Decimal('199')))
+        results, _ = get_backend().search_page('nirmala')
+        self.assertEqual([result.item_id for result in results], [self.book.id])
+        self.assertEqual(get_backend().search_page('godan')[0], [])
+        self.assertEqual([entry['title'] for entry in autocomplete_index.suggest('nir')], ["Nirmala"])
+        self.assertEqual(autocomplete_index.suggest('god'), [])
+
+    def test_bulk_writes_sync_catalog_items(self):
+        self.book.title = "Nirmala"
+        self.book.search_key = 'nirmala'
+        Book.objects.bulk_update([self.book], ['title', 'search_key'])
+        item = CatalogItem.objects.get(kind=CatalogItem.BOOK, item_id=self.book.id)
+        self.assertEqual((item.title, item.search_key), ("Nirmala", 'nirmala'))
+
+        Book.objects.filter(pk=self.book.pk).update(on_sale=True)
+        self.assertTrue(CatalogItem.objects.get(kind=CatalogItem.BOOK, item_id=self.book.id).on_sale)
+
+        created, = Book.objects.bulk_create([
+            Book(title="Gaban", slug='gaban', search_key='gaban', category='hindi', price=Decimal('150')),
+        ])
+        self.assertTrue(CatalogItem.objects.filter(kind=CatalogItem.BOOK, item_id=created.id, title="Gaban").exists())
+
+
+class CatalogVersionTests(TempMediaMixin, TestCase):
+    def setUp(self):
+        cache.clear()
+        self.book = Book.objects.create(title="Godan", category='hindi', price=Decimal('250'), image='books/cover.jpg')
+
+    def test_caches_are_invalidated_only_once_committed(self):
+        page_key = PAGE_KEY.format(label='homepage.book', slug=self.book.slug)
+        cache.set(page_key, {'pk': self.book.pk, 'html': 'cached'})
+        version = get_catalog_version()
+
+        self.book.title = "Nirmala"
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.book.save()
+            self.assertEqual(get_catalog_version(), version)
+            self.assertEqual(cache.get(page_key)['html'], 'cached')
+        for callback in callbacks:
+            callback()
+
+        self.assertGreater(get_catalog_version(), version)
+        self.assertIsNone(cache.get(page_key))
+
+    def test_shelves_are_served_stale_while_one_rebuild_runs(self):
+        first = render_shelf_fragments()
+        self.assertIn("Godan", ''.join(first))
+        with self.assertNumQueries(0):
+            self.assertEqual(render_shelf_fragments(), first)
+
+        self.book.title = "Nirmala"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.book.save()
+        with mock.patch('homepage.shelves._rebuild_in_background') as rebuild:
+            self.assertEqual(render_shelf_fragments(), first)
+            self.assertEqual(render_shelf_fragments(), first)
+        rebuild.assert_called_once_with(get_catalog_version())
+
+
+class CategoryStatsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def stats(self, category):
+        return CategoryStats.objects.get(catalog=CategoryStats.BOOK, category=category)
+
+    def test_refreshed_after_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            Book.objects.create(title="Godan", category='hindi', price=Decimal('250'), on_sale=True)
+        with self.captureOnCommitCallbacks() as callbacks:
+            book = Book.objects.create(title="Gaban", category='hindi', price=Decimal('150'))
+            self.assertEqual(self.stats('hindi').total, 1)
+        for callback in callbacks:
+            callback()
+
+        stats = self.stats('hindi')
+        self.assertEqual((stats.total, stats.on_sale, stats.min_price, stats.max_price), (2, 1, Decimal('150'), Decimal('250')))
+        self.assertEqual(category_stats()['hindi'].total, 2)
+
+        book.category = 'romance'
+        with self.captureOnCommitCallbacks(execute=True):
+            book.save()
+        self.assertEqual((self.stats('hindi').total, self.stats('romance').total), (1, 1))
+        self.assertEqual(category_stats()['hindi'].total, 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            book.delete()
+        self.assertEqual(self.stats('romance').total, 0)
+        self.assertIsNone(self.stats('romance').min_price)
+
+
+class DeferredRefreshTests(TempMediaMixin, TestCase):
+    def setUp(self):
+        cache.clear()
+        prerender_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, prerender_root)
+        self.enterContext(override_settings(PRERENDER_ROOT=prerender_root))
+        product_variety.objects.create(name="Hindi", type='HIN', image='product_categories/x.jpg')
+
+    def test_productcatagory_is_re_rendered_after_commit(self):
+        prerender_page('productcatagory')
+        with self.captureOnCommitCallbacks() as callbacks:
+            Book.objects.create(title="Godan", category='hindi', price=Decimal('250'))
+        self.assertNotIn(b'1 book<', page_path('productcatagory').read_bytes())
+        for callback in callbacks:
+            callback()
+        self.assertIn(b'1 book<', page_path('productcatagory').read_bytes())
+        self.assertTrue(page_path('productcatagory').with_suffix('.html.gz').exists())
+
+    def test_image_data_is_computed_after_commit(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            book = Book.objects.create(title="Godan", category='hindi', price=Decimal('250'), image='books/cover.jpg')
+        self.assertEqual(CatalogItem.objects.get(kind=CatalogItem.BOOK, item_id=book.id).image_placeholder, '')
+        for callback in callbacks:
+            callback()
+
+        item = CatalogItem.objects.get(kind=CatalogItem.BOOK, item_id=book.id)
+        self.assertEqual((item.image_width, item.image_height), (40, 60))
+        self.assertRegex(item.image_placeholder, r'^#[0-9a-f]{6}$')
+        book.refresh_from_db()
+        self.assertEqual(book.image_variants['source'], 'books/cover.jpg')
+
+
+class PrerenderedPageTests(TestCase):
+    def setUp(self):
+        prerender_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, prerender_root)
+        self.enterContext(override_settings(PRERENDER_ROOT=prerender_root))
+        prerender_page('aboutus')
+        self.url = reverse('aboutus')
+
+    def test_serves_the_file_without_queries(self):
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/html; charset=utf-8')
+        self.assertIn('Accept-Encoding', response['Vary'])
+        self.assertEqual(b''.join(response.streaming_content), page_path('aboutus').read_bytes())
+
+    def test_negotiates_compression_and_revalidation(self):
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(response.status_code, 200)
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=response['ETag'], HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response.status_code, 304)
+
+    def test_falls_back_to_the_view_without_a_file(self):
+        page_path('aboutus').unlink()
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, 'pages/Aboutus.html')
+
+class ConditionalGetTests(TempMediaMixin, TestCase):
+    def setUp(self):
+        cache.clear()
+        self.book = Book.objects.create(title="Godan", category='hindi', price=Decimal('250'), image='books/cover.jpg')
+        self.url = reverse('category_view', args=['hindi-books'])
+
+    def test_not_modified_until_the_catalog_changes(self):
+        response = self.client.get(self.url)
+        etag = response['ETag']
+        self.assertTrue(response.has_header('Last-Modified'))
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.book.delete()
+        cache.delete(CATALOG_STATE_KEY)
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_validators_cost_primary_key_lookups(self):
+        cache.delete(CATALOG_STATE_KEY)
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(self.url, HTTP_IF_NONE_MATCH='W/"other"')
+        state_queries = [query['sql'] for query in queries if 'catalogrevision' in query['sql']]
+        self.assertEqual(len(state_queries), 1)
+        self.assertIn('"id" = 1', state_queries[0])
+
+
+class ShelfLoaderTests(TestCase):
+    def test_first_books_of_every_shelf_in_one_query(self):
+        for n in range(12):
+            Book.objects.create(title=f"Hindi {n:02}", category='hindi', price=Decimal('100'))
+        Book.objects.create(title="Romance full price", category='romance', price=Decimal('100'))
+        Book.objects.create(title="Romance on sale", category='romance', price=Decimal('100'), on_sale=True)
+
+        with self.assertNumQueries(1):
+            shelves = {shelf.slug: shelf for shelf in load_shelves(limit=10)}
+        self.assertEqual(list(shelves), list(CATEGORY_SLUG_MAP))
+        self.assertEqual([book.title for book in shelves['hindi-books'].books], [f"Hindi {n:02}" for n in range(10)])
+        self.assertEqual([book.title for book in shelves['romance-sale'].books], ["Romance on sale"])
+        self.assertEqual(shelves['best-sellers'].books, [])
+
+
+class RecommendationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.a, cls.b, cls.c, cls.d = (
+            Book.objects.create(title=title, category='hindi', price=Decimal('100')) for title in "ABCD"
+        )
+
+    def order(self, *books, status='processing'):
+        order = Order.objects.create(
+            email='reader@example.com', phone_number='1', full_name='A Reader', address='x',
+            city='x', state='x', pin_code='1', status=status,
+        )
+        OrderItem.objects.bulk_create([
+            OrderItem(order=order, item_type='book', item_id=book.id, title=book.title, price=book.price)
+            for book in books
+        ])
+        return order
+
+    def recommended(self, book):
+        return [other.id for other in suggested_books(book, count=2)]
+
+    def test_ranks_books_bought_together(self):
+        self.order(self.a, self.b)
+        self.order(self.a, self.b)
+        self.order(self.a, self.c)
+        self.order(self.a, self.d, status='cancelled')
+        run = build_recommendations()
+        self.assertEqual(run.orders_processed, 3)
+        self.assertEqual(self.recommended(self.a), [self.b.id, self.c.id])
+        self.assertEqual(self.recommended(self.c)[0], self.a.id)
+
+    def test_runs_are_incremental_and_wait_for_pending_orders(self):
+        self.order(self.a, self.b)
+        build_recommendations()
+        pending = self.order(self.a, self.c, status='pending_payment')
+        self.order(self.a, self.c)
+        self.order(self.a, self.c)
+        run = build_recommendations()
+        self.assertEqual(run.orders_processed, 0)
+        self.assertEqual(run.last_order_id, pending.id - 1)
+
+        Order.objects.filter(pk=pending.pk).update(status='processing')
+        run = build_recommendations()
+        self.assertEqual(run.orders_processed, 3)
+        self.assertEqual(self.recommended(self.a), [self.c.id, self.b.id])
+
+
+class AutocompleteTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        Book.objects.create(title="गोदान", category='hindi', price=Decimal('100'))
+        Book.objects.create(title="Naruto Vol 1", category='manga_comics', price=Decimal('100'))
+
+    def titles(self, index, query):
+        return [entry['title'] for entry in index.suggest(query)]
+
+    def test_prefix_matches_titles_and_transliterations(self):
+        index = PrefixIndex()
+        with self.assertNumQueries(1):
+            self.assertEqual(self.titles(index, 'naru'), ["Naruto Vol 1"])
+        with self.assertNumQueries(0):
+            self.assertEqual(self.titles(index, 'vol'), ["Naruto Vol 1"])
+            self.assertEqual(self.titles(index, 'goda'), ["गोदान"])
+            self.assertEqual(self.titles(index, 'गोदा'), ["गोदान"])
+            self.assertEqual(index.suggest('zzz'), [])
+
+    def test_stale_index_answers_while_one_reload_runs(self):
+        index = PrefixIndex()
+        index.suggest('naru')
+        bump_catalog_version()
+        with mock.patch('demo.catalog_index.threading.Thread') as thread:
+            self.assertEqual(self.titles(index, 'naru'), ["Naruto Vol 1"])
+            self.assertEqual(self.titles(index, 'naru'), ["Naruto Vol 1"])
+        thread.assert_called_once()
+        thread.return_value.start.assert_called_once_with()
+
+
+class BM25SearchTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.books = [
+            Book.objects.create(title=f"Romance Story {n}", category='romance', price=Decimal('100'))
+            for n in range(5)
+        ]
+        # Matches "romance" through its category label only
+        self.label_only = Book.objects.create(title="Pride and Prejudice", category='romance', price=Decimal('100'))
+        self.backend = BM25SearchBackend()
+
+    def test_title_matches_rank_above_label_matches(self):
+        results, cursor = self.backend.search_page('romance')
+        self.assertIsNone(cursor)
+        self.assertEqual(len(results), 6)
+        self.assertEqual(results[-1].item_id, self.label_only.id)
+        self.assertGreater(results[0].score, results[-1].score)
+        self.assertEqual([result.item_id for result in self.backend.search_page('pride')[0]], [self.label_only.id])
+
+    def test_pages_cover_every_result_once(self):
+        seen = []
+        cursor = None
+        while True:
+            results, cursor = self.backend.search_page('romance', cursor, page_size=4)
+            seen += [result.item_id for result in results]
+            if cursor is None:
+                break
+        self.assertEqual(sorted(seen), sorted(book.id for book in [*self.books, self.label_only]))
+
+    def test_changes_from_this_process_apply_in_place(self):
+        self.backend.rebuild()
+        item = CatalogItem(kind=CatalogItem.BOOK, item_id=self.label_only.id)
+        self.backend.remove(item, bump_catalog_version())
+        self.assertEqual(self.backend.search_page('pride')[0], [])
+        self.assertEqual(len(self.backend.search_page('romance')[0]), 5)
+
+
+class SearchKeyTests(TestCase):
+    def test_normalizes_and_transliterates(self):
+        self.assertEqual(search_key("  Naruto:  VOL. 1 "), 'naruto vol 1')
+        self.assertEqual(search_key("गोदान"), 'godan')
+
+    def test_saving_the_title_alone_writes_the_key(self):
+        book = Book.objects.create(title="Godan", category='hindi', price=Decimal('100'))
+        book.title = "Nirmala"
+        book.save(update_fields=['title'])
+        book.refresh_from_db()
+        self.assertEqual(book.search_key, 'nirmala')
+
+    def test_backfill_updates_catalog_items_and_version(self):
+        cache.clear()
+        book = Book.objects.create(title="Godan", category='hindi', price=Decimal('100'))
+        Book.objects.filter(pk=book.pk).update(search_key='')
+        version = get_catalog_version()
+        call_command('backfill_search_keys', stdout=StringIO())
+        self.assertEqual(CatalogItem.objects.get(kind=CatalogItem.BOOK, item_id=book.id).search_key, 'godan')
+        self.assertGreater(get_catalog_version(), version)
+
+
+class ImportCatalogTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_imports_valid_rows_in_batches(self):
+        Book.objects.create(title="Godan", category='hindi', price=Decimal('100'))
+        rows = enumerate([
+            {'title': "Godan", 'category': 'hindi', 'price': '150', 'on_sale': 'yes'},
+            {'title': "Godan", 'category': 'hindi', 'price': '120'},
+            {'title': "Nowhere", 'category': 'poetry', 'price': '99'},
+            {'title': "Gaban", 'category': 'hindi'},
+            {'title': "Nirmala", 'category': 'hindi', 'price': '90'},
+        ], start=2)
+        version = get_catalog_version()
+        result = import_catalog(rows, Book, batch_size=2)
+
+        self.assertEqual(result.created, 3)
+        self.assertEqual([line for line, _ in result.errors], [4, 5])
+        self.assertEqual(
+            list(Book.objects.order_by('id').values_list('slug', flat=True)),
+            ['godan', 'godan-1', 'godan-2', 'nirmala'],
+        )
+        self.assertEqual(CatalogItem.objects.filter(kind=CatalogItem.BOOK).count(), 4)
+        self.assertEqual(CategoryStats.objects.get(catalog=CategoryStats.BOOK, category='hindi').total, 4)
+        self.assertGreater(get_catalog_version(), version)
+
+    def test_retries_a_batch_whose_slug_was_taken(self):
+        Book.objects.create(title="Godan", category='hindi', price=Decimal('100'))
+        with mock.patch('homepage.catalog_import.allocate_slugs', side_effect=[['godan'], ['godan-1']]) as allocate:
+            result = import_catalog(enumerate([{'title': "Godan", 'category': 'hindi', 'price': '150'}]), Book)
+        self.assertEqual(result.created, 1)
+        self.assertEqual(allocate.call_count, 2)
+        self.assertTrue(Book.objects.filter(slug='godan-1').exists())
@@ -0,0 +1,113 @@
+# homepage/videos.py
+import json
+import os
+import posixpath
+import subprocess
+import threading
+from pathlib import Path
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from PIL import Image
+
+# (height, H.264 max bitrate); only heights below the source's are encoded
+RENDITIONS = ((360, '600k'), (720, '1500k'))
+POSTER_OFFSET_SECONDS = 1
+RENDITION_DIR = 'video'
+MANIFEST_NAME = 'manifest.json'
+
+_manifests = {}
+_manifests_lock = threading.Lock()
+
+
+def rendition_dir(name):
+    """Media-relative directory holding the poster, renditions and manifest of one promo video"""
+    return f"{RENDITION_DIR}/{posixpath.splitext(posixpath.basename(name))[0]}"
+
+
+def _ffmpeg(*args):
+    subprocess.run(
+        [settings.FFMPEG_BINARY, '-y', '-loglevel', 'error', *args],
+        check=True, capture_output=True, timeout=600,
+    )
+
+
+def build_renditions(source):
+    """
+    Extract a poster frame, remux the original with the index up front
+    (+faststart, so playback starts before the whole file arrives) and encode
+    smaller H.264 renditions of the promo video at `source`, then write the
+    manifest read by the promo_video template tag. Returns the manifest.
+    """
+    source = Path(source)
+    out_dir = Path(settings.MEDIA_ROOT) / rendition_dir(source.name)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    poster = out_dir / 'poster.jpg'
+    try:
+        _ffmpeg('-ss', str(POSTER_OFFSET_SECONDS), '-i', str(source), '-frames:v', '1', '-q:v', '3', str(out_dir / 'poster.tmp.jpg'))
+        os.replace(out_dir / 'poster.tmp.jpg', poster)
+    except (subprocess.CalledProcessError, FileNotFoundError):
+        # Clips shorter than the offset produce no frame: take the first one
+        _ffmpeg('-i', str(source), '-frames:v', '1', '-q:v', '3', str(out_dir / 'poster.tmp.jpg'))
+        os.replace(out_dir / 'poster.tmp.jpg', poster)
+    with Image.open(poster) as image:
+        width, height = image.size
+
+    renditions = []
+    full = out_dir / 'full.mp4'
+    _ffmpeg('-i', str(source), '-c', 'copy', '-movflags', '+faststart', str(out_dir / 'full.tmp.mp4'))
+    os.replace(out_dir / 'full.tmp.mp4', full)
+    renditions.append({'file': full.name, 'width': width, 'height': height, 'bytes': full.stat().st_size})
+
+    for target_height, max_rate in RENDITIONS:
+        if target_height >= height:
+            continue
+        target = out_dir / f'{target_height}p.mp4'
+        _ffmpeg(
+            '-i', str(source),
+            '-vf', f'scale=-2:{target_height}',
+            '-c:v', 'libx264', '-preset', 'slow', '-crf', '26', '-maxrate', max_rate, '-bufsize', max_rate,
+            '-profile:v', 'main', '-pix_fmt', 'yuv420p',
+            '-c:a', 'aac', '-b:a', '64k',
+            '-movflags', '+faststart',
+            str(out_dir / f'{target_height}p.tmp.mp4'),
+        )
+        os.replace(out_dir / f'{target_height}p.tmp.mp4', target)
+        target_width = round(width * target_height / height / 2) * 2
+        renditions.append({'file': target.name, 'width': target_width, 'height': target_height, 'bytes': target.stat().st_size})
+
+    manifest = {
+        'source_mtime': source.stat().st_mtime,
+        'poster': poster.name,
+        'renditions': sorted(renditions, key=lambda rendition: rendition['height']),
+    }
+    (out_dir / 'manifest.tmp.json').write_text(json.dumps(manifest))
+    os.replace(out_dir / 'manifest.tmp.json', out_dir / MANIFEST_NAME)
+    return manifest
+
+
+def load_manifest(name):
+    """
+    Manifest of a promo video with media URLs filled in, or None if the
+    renditions were never built. Re-read only when the file changes.
+    """
+    path = Path(settings.MEDIA_ROOT) / rendition_dir(name) / MANIFEST_NAME
+    try:
+        mtime = path.stat().st_mtime
+    except OSError:
+        return None
+
+    with _manifests_lock:
+        cached = _manifests.get(name)
+        if cached and cached[0] == mtime:
+            return cached[1]
+
+    manifest = json.loads(path.read_text())
+    base = rendition_dir(name)
+    manifest['poster_url'] = default_storage.url(f"{base}/{manifest['poster']}")
+    for rendition in manifest['renditions']:
+        rendition['url'] = default_storage.url(f"{base}/{rendition['file']}")
+    with _manifests_lock:
+        _manifests[name] = (mtime, manifest)
+    return manifest
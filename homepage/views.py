@@ -1,95 +1,77 @@
-from django.shortcuts import render, get_object_or_404
+from django.shortcuts import render
 from django.http import Http404
 from .models import Book
-from django.core.paginator import Paginator
+from .images import srcset
 from django.http import JsonResponse
+from django.utils.cache import patch_vary_headers
+from django.views.decorators.http import condition
+from .category_stats import shelf_count
+from .conditional import catalog_etag, catalog_last_modified
+from .page_cache import detail_page
+from .pagination import PAGE_SIZE, encode_cursor, keyset_page
+from .suggestions import suggested_books
+from .shelves import CATEGORY_SLUG_MAP, render_shelf_fragments, shelf_filter
 
 def home_page(request):
     context = {
-        'new_arrivals_books': Book.objects.filter(category='new_arrivals').order_by('title'),
-        'manga_comics_books': Book.objects.filter(category='manga_comics').order_by('title'),
-        'most_read_combos_books': Book.objects.filter(category='most_read_combos').order_by('title'),
-        'self_improvements_books': Book.objects.filter(category='self_improvements', on_sale=True).order_by('title'),
-        'romance_sale_books': Book.objects.filter(category='romance', on_sale=True).order_by('title'),
-        'hindi_books': Book.objects.filter(category='hindi').order_by('title'),
-        'business_stock_market_books': Book.objects.filter(category='business_stock_market').order_by('title'),
-        'best_sellers_books': Book.objects.filter(category='best_sellers').order_by('title'),
+        'shelf_fragments': render_shelf_fragments(),
     }
+    # Cache-Control comes from the 'catalog' policy (demo.middleware.CacheControlMiddleware)
     response = render(request, 'index.html', context)
-
-    response["Cache-Control"] = "no-store, no-cache, must-revalidate, max-age=0"
-    response["Pragma"] = "no-cache"
-    response["Expires"] = "0"
+    # The promo videos offer fewer renditions to Save-Data clients (see promo_videos.promo_video)
+    patch_vary_headers(response, ['Save-Data'])
     return response
 
+@condition(etag_func=catalog_etag, last_modified_func=catalog_last_modified)
 def book_detail(request, slug):
-    book = get_object_or_404(Book, slug=slug)
-    suggested_books = Book.objects.exclude(id=book.id).order_by('?')[:10]
-    return render(request, 'book_detail.html', {
-        'book': book,
-        'suggested_books': suggested_books,
-        'model_type': 'book',
-    })
-
-CATEGORY_SLUG_MAP = {
-    'new-arrivals': {'category': 'new_arrivals', 'on_sale': False, 'name': 'NEW ARRIVALS'},
-    'manga-comics': {'category': 'manga_comics', 'on_sale': False, 'name': 'MANGA & COMICS'},
-    'most-read-combos': {'category': 'most_read_combos', 'on_sale': False, 'name': 'MOST READ COMBOS'},
-    'self-improvements': {'category': 'self_improvements', 'on_sale': True, 'name': 'SELF IMPROVEMENTS'},
-    'romance-sale': {'category': 'romance', 'on_sale': True, 'name': 'ROMANCE ON SALE'},
-    'hindi-books': {'category': 'hindi', 'on_sale': False, 'name': 'HINDI BOOKS'},
-    'business-stock-market': {'category': 'business_stock_market', 'on_sale': False, 'name': 'BUSINESS & STOCK-MARKET'},
-    'best-sellers': {'category': 'best_sellers', 'on_sale': False, 'name': 'BEST SELLERS'},
-}
-
-# homepage/views.py
+    return detail_page(request, Book, slug, suggested_books)
 
+@condition(etag_func=catalog_etag, last_modified_func=catalog_last_modified)
 def category_view(request, category_slug):
     config = CATEGORY_SLUG_MAP.get(category_slug)
     if not config:
         raise Http404(f"Category '{category_slug}' not found")
 
-    books = Book.objects.filter(category=config['category'])
-    if config['on_sale']:
-        books = books.filter(on_sale=True)
-    
-    books = books.order_by('title')
-    total_books = books.count()
-
+    books = Book.objects.filter(shelf_filter(config))
+    books_page, next_cursor = keyset_page(books)
 
-    paginator = Paginator(books, 20) 
-    books_page = paginator.page(1)
-
-    has_more = books_page.has_next()
-    
     return render(request, 'pages/category_detail.html', {
-        'books': books_page.object_list,
+        'books': books_page,
         'category_name': config['name'],
         'category_slug': category_slug,
-        'has_more': has_more,
-        'total_books': total_books,
+        'has_more': next_cursor is not None,
+        'next_cursor': next_cursor,
+        'total_books': shelf_count(config),
     })
     
+@condition(etag_func=catalog_etag, last_modified_func=catalog_last_modified)
 def category_load_more(request, category_slug):
     config = CATEGORY_SLUG_MAP.get(category_slug)
     if not config:
         return JsonResponse({'success': False, 'error': 'Category not found'})
-    
-    try:
-        page = int(request.GET.get('page', 2))
-    except:
-        page = 2
-    
-    books = Book.objects.filter(category=config['category'])
-    if config['on_sale']:
-        books = books.filter(on_sale=True)
-    
-    books = books.order_by('title')
-    paginator = Paginator(books, 20)  # Must match initial load
-    
+
+    books = Book.objects.filter(shelf_filter(config))
+    cursor = request.GET.get('cursor')
+
     try:
-        books_page = paginator.page(page)
-    except:
+        if cursor:
+            books_page, next_cursor = keyset_page(books, cursor)
+        else:
+            # Legacy ?page=N clients (cached script.js) - plain slice, no COUNT(*)
+            try:
+                page = max(int(request.GET.get('page', 2)), 1)
+            except (TypeError, ValueError):
+                page = 2
+            offset = (page - 1) * PAGE_SIZE
+            books_page = list(books.order_by('title', 'id')[offset:offset + PAGE_SIZE + 1])
+            next_cursor = None
+            if len(books_page) > PAGE_SIZE:
+                books_page = books_page[:PAGE_SIZE]
+                next_cursor = encode_cursor(books_page[-1].title, books_page[-1].id)
+    except ValueError:
+        return JsonResponse({'success': False, 'error': 'Invalid cursor'}, status=400)
+
+    if not books_page:
         return JsonResponse({'success': False, 'error': 'No more books'})
     
     books_data = []
@@ -103,11 +85,17 @@ def category_load_more(request, category_slug):
             'price': str(book.price),
             'old_price': str(book.old_price) if book.old_price else None,
             'image_url': image_url,
+            'image_srcset': srcset(book),
+            'image_webp_srcset': srcset(book, 'webp'),
+            'image_width': book.image_width,
+            'image_height': book.image_height,
+            'image_placeholder': book.image_placeholder,
             'on_sale': book.on_sale,
         })
     
     return JsonResponse({
         'success': True,
         'books': books_data,
-        'has_next': books_page.has_next(),
+        'has_next': next_cursor is not None,
+        'next_cursor': next_cursor,
     })
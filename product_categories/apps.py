@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class ProductCategoriesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'product_categories'
+
+    def ready(self):
+        from . import signals  # noqa: F401
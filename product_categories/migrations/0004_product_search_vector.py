@@ -0,0 +1,41 @@
+# Generated by Django 5.2.8 on 2026-10-17 01:38
+
+import django.contrib.postgres.search
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+def create_search_indexes(apps, schema_editor):
+    # GIN indexes only exist on PostgreSQL; other backends keep plain substring search
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(
+        "CREATE INDEX IF NOT EXISTS product_categories_product_search_vector_gin ON product_categories_product USING gin (search_vector)"
+    )
+    schema_editor.execute(
+        "CREATE INDEX IF NOT EXISTS product_categories_product_title_trgm ON product_categories_product USING gin (title gin_trgm_ops)"
+    )
+
+
+def drop_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute("DROP INDEX IF EXISTS product_categories_product_search_vector_gin")
+    schema_editor.execute("DROP INDEX IF EXISTS product_categories_product_title_trgm")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('product_categories', '0003_rename_date_updated_product_variety_date_added'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name='product',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
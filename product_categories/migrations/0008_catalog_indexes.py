@@ -0,0 +1,21 @@
+# Generated by Django 5.2.8 on 2026-10-17 02:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('product_categories', '0007_product_image_height_product_image_placeholder_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['category', 'title', 'id'], name='product_category_title'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['-date_added'], name='product_date_added_desc'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-17 02:12
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('homepage', '0010_catalogitem'),
+        ('product_categories', '0008_catalog_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='product',
+            name='search_vector',
+        ),
+    ]
@@ -2,8 +2,10 @@
 from django.db import models
 from django.utils import timezone
 from django.urls import reverse
-from django.utils.text import slugify
-import re
+
+from homepage.models import CatalogSourceQuerySet
+from homepage.search_keys import search_key
+from homepage.slugs import unique_slug
 
 class product_variety(models.Model):
     PRODUCT_TYPE_CHOICE = [
@@ -35,20 +37,25 @@ class Product(models.Model):
     image = models.ImageField(upload_to='products/', blank=True, null=True)
     date_added = models.DateTimeField(auto_now_add=True)
     description = models.TextField(blank=True, null=True, help_text="Description of the product")
+    # Normalized, transliterated title for indexed prefix matching (see homepage.search_keys)
+    search_key = models.CharField(max_length=255, blank=True, default='', editable=False)
+    # {'source': image name, 'widths': [...]} of the resized copies (see homepage.images)
+    image_variants = models.JSONField(default=dict, blank=True, editable=False)
+    # Intrinsic size and dominant colour of the image, so pages can reserve space and paint before it loads
+    image_width = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    image_height = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    image_placeholder = models.CharField(max_length=7, blank=True, default='', editable=False)
+
+    objects = CatalogSourceQuerySet.as_manager()
 
     def save(self, *args, **kwargs):
         if not self.slug:
-            clean_title = re.sub(r'[^\w\s-]', '', self.title)
-            clean_title = re.sub(r'\s+', ' ', clean_title).strip()
-            base_slug = slugify(clean_title)
-            
-            slug = base_slug
-            counter = 1
-            while self.__class__.objects.filter(slug=slug).exists():
-                slug = f"{base_slug}-{counter}"
-                counter += 1
-                
-            self.slug = slug
+            self.slug = unique_slug(self.__class__, self.title)
+        self.search_key = search_key(self.title)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'title' in update_fields:
+            # The key follows the title, so it must be written with it
+            kwargs['update_fields'] = {*update_fields, 'search_key'}
         super().save(*args, **kwargs)
 
     def get_absolute_url(self):
@@ -62,4 +69,12 @@ class Product(models.Model):
         return '/static/images/placeholder.png'
 
     def __str__(self):  
-        return f"{self.title} ({self.category.get_type_display()})"
\ No newline at end of file
+        return f"{self.title} ({self.category.get_type_display()})"
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['search_key'], name='product_search_key_prefix', opclasses=['varchar_pattern_ops']),
+            # Products of one category by title (keyset pagination order)
+            models.Index(fields=['category', 'title', 'id'], name='product_category_title'),
+            models.Index(fields=['-date_added'], name='product_date_added_desc'),
+        ]
@@ -0,0 +1,77 @@
+# product_categories/signals.py
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from demo.autocomplete import autocomplete_index
+from demo.prerender import refresh_prerendered
+from demo.search import get_backend
+from homepage.cache import bump_catalog_version
+from homepage.catalog import remove_catalog_item, sync_catalog_item, sync_variety
+from homepage.category_stats import category_code, refresh_category_stats
+from homepage.images import refresh_image_data
+from homepage.page_cache import invalidate_detail_page
+
+from .models import Product, product_variety
+
+
+@receiver(pre_save, sender=Product)
+def product_saving(sender, instance, **kwargs):
+    # The category the row is leaving, whose CategoryStats need refreshing too, and
+    # the slug whose cached detail page must go if this save renames it
+    previous = (
+        Product.objects.filter(pk=instance.pk).values_list('category__type', 'slug').first() if instance.pk else None
+    )
+    instance._previous_category, instance._previous_slug = previous or (None, None)
+
+
+@receiver(post_save, sender=Product)
+def product_saved(sender, instance, **kwargs):
+    item = sync_catalog_item(instance)
+    categories = {category_code(instance), getattr(instance, '_previous_category', None)}
+
+    def publish():
+        # Resizes the cover when it changed; its update() carries the result to the CatalogItem
+        refresh_image_data(instance)
+        invalidate_detail_page(instance)
+        refresh_category_stats(Product, categories)
+        version = bump_catalog_version()
+        get_backend().index(item, version)
+        autocomplete_index.update(item, version)
+
+    # Once committed, so no other process rebuilds its caches or indexes from an uncommitted row
+    transaction.on_commit(publish)
+
+
+@receiver(post_delete, sender=Product)
+def product_deleted(sender, instance, **kwargs):
+    item = remove_catalog_item(instance)
+    categories = {category_code(instance)}
+
+    def publish():
+        invalidate_detail_page(instance)
+        refresh_category_stats(Product, categories)
+        version = bump_catalog_version()
+        get_backend().remove(item, version)
+        autocomplete_index.remove(item, version)
+
+    transaction.on_commit(publish)
+
+
+@receiver(post_save, sender=product_variety)
+def variety_saved(sender, instance, created, **kwargs):
+    # Category labels are part of every product's search and autocomplete terms
+    items = None if created else sync_variety(instance)
+
+    def publish():
+        if items is not None:
+            get_backend().index_many(items)
+            bump_catalog_version()
+        refresh_prerendered('productcatagory')
+
+    transaction.on_commit(publish)
+
+
+@receiver(post_delete, sender=product_variety)
+def variety_deleted(sender, instance, **kwargs):
+    transaction.on_commit(lambda: refresh_prerendered('productcatagory'))
@@ -1,9 +1,10 @@
-from django.shortcuts import render ,get_object_or_404
-from django.http import Http404
+from django.shortcuts import render
 from .models import product_variety, Product
-from homepage.models import Book
-from django.core.paginator import Paginator
-from django.http import JsonResponse
+from demo.prerender import serve_prerendered
+from homepage.category_stats import shelf_count
+from homepage.page_cache import detail_page
+from homepage.shelves import CATEGORY_SLUG_MAP
+from homepage.suggestions import random_suggestions
 
 # Map type codes to models and display names
 CATEGORY_TYPE_TO_SLUG = {
@@ -18,6 +19,7 @@ CATEGORY_TYPE_TO_SLUG = {
 }
 
 
+@serve_prerendered('productcatagory')
 def productcatagory(request):
     """Show all product categories and map them to the unified category pages"""
     products = product_variety.objects.all().order_by('type')
@@ -25,9 +27,12 @@ def productcatagory(request):
     # Add slug mapping for each category
     categories_with_slugs = []
     for category in products:
+        slug = CATEGORY_TYPE_TO_SLUG.get(category.type, '')
         categories_with_slugs.append({
             'category': category,
-            'slug': CATEGORY_TYPE_TO_SLUG.get(category.type, '')
+            'slug': slug,
+            # Books on the linked category page, from CategoryStats rather than a COUNT(*) per category
+            'count': shelf_count(CATEGORY_SLUG_MAP[slug]) if slug in CATEGORY_SLUG_MAP else 0,
         })
     
     return render(request, 'pages/productcatagory.html', {
@@ -35,10 +40,4 @@ def productcatagory(request):
     })
 def product_detail(request, slug):
     """Display detailed view of a single product"""
-    book = get_object_or_404(Product, slug=slug)
-    suggested_books = Book.objects.order_by('?')[:10]
-    return render(request, 'book_detail.html', {
-        'book': book,
-        'suggested_books': suggested_books,
-        'model_type': 'book',
-    })
\ No newline at end of file
+    return detail_page(request, Product, slug, lambda product: random_suggestions())
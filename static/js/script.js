@@ -484,6 +484,7 @@ document.addEventListener("DOMContentLoaded", function () {
   }
 
   let currentPage = 1;
+  let nextCursor = bookGrid.dataset.nextCursor || "";
   const categorySlug = bookGrid.dataset.categorySlug;
   
   // Detect which type of category page we're on
@@ -501,10 +502,13 @@ document.addEventListener("DOMContentLoaded", function () {
     try {
       currentPage++;
       
-      // Use correct URL for product categories
+      // Use correct URL for product categories; prefer the cursor when the server sent one
+      const query = nextCursor
+        ? `cursor=${encodeURIComponent(nextCursor)}`
+        : `page=${currentPage}`;
       const url = isProductCategory 
-        ? `/productcatagory/${categorySlug}/load-more/?page=${currentPage}`
-        : `/category/${categorySlug}/load-more/?page=${currentPage}`;
+        ? `/productcatagory/${categorySlug}/load-more/?${query}`
+        : `/category/${categorySlug}/load-more/?${query}`;
       
       console.log("Load More: Fetching URL:", url);
 
@@ -522,6 +526,8 @@ document.addEventListener("DOMContentLoaded", function () {
           if (bookCard) bookGrid.appendChild(bookCard);
         });
 
+        nextCursor = data.next_cursor || "";
+
         // Hide button when no more books
         if (!data.has_next) {
           loadMoreBtn.style.display = "none";
@@ -563,9 +569,24 @@ document.addEventListener("DOMContentLoaded", function () {
 
       const saleTag = book.on_sale ? `<span class="sale-tag">Sale</span>` : "";
 
+      // Same markup as templates/includes/cover_image.html
+      const sizes = "(max-width: 480px) 100vw, (max-width: 800px) 50vw, 260px";
+      const webpSource = book.image_webp_srcset
+        ? `<source type="image/webp" srcset="${book.image_webp_srcset}" sizes="${sizes}" />`
+        : "";
+      const srcsetAttrs = book.image_srcset
+        ? `srcset="${book.image_srcset}" sizes="${sizes}"`
+        : "";
+      const sizeAttrs = book.image_width && book.image_height
+        ? `width="${book.image_width}" height="${book.image_height}"`
+        : "";
+      const placeholderStyle = book.image_placeholder
+        ? `style="background-color: ${book.image_placeholder}"`
+        : "";
+
       link.innerHTML = `
-        <img src="${book.image_url}" alt="${book.title}" 
-             onerror="this.src='/static/images/placeholder.png'; this.onerror=null;" />
+        <picture class="cover">${webpSource}<img src="${book.image_url}" ${srcsetAttrs} ${sizeAttrs} ${placeholderStyle} loading="lazy" decoding="async" alt="${book.title}" 
+             onerror="this.onerror=null; this.removeAttribute('srcset'); this.parentNode.querySelectorAll('source').forEach(function (s) { s.remove(); }); this.src='/static/images/placeholder.png';" /></picture>
         ${saleTag}
         <h3 class="book-title">${book.title}</h3>
         ${priceHtml}
@@ -687,15 +708,40 @@ document.addEventListener('DOMContentLoaded', function() {
     isDown = false;
   });
 
+  // Videos use preload="none": start each one only when it scrolls into view
+  // and pause it when it leaves, so the page does not download every video up front
+  const visibleVideos = new WeakSet();
+  const playVideo = video => video.play().catch(e => console.log('Autoplay prevented:', e));
+  const videoObserver = 'IntersectionObserver' in window
+    ? new IntersectionObserver(entries => {
+        entries.forEach(entry => {
+          if (entry.isIntersecting) {
+            visibleVideos.add(entry.target);
+            playVideo(entry.target);
+          } else {
+            visibleVideos.delete(entry.target);
+            entry.target.pause();
+          }
+        });
+      }, { threshold: 0.5 })
+    : null;
+
   // ENSURE VIDEOS KEEP PLAYING - Restart if stopped
   videoSlides.forEach(slide => {
     const video = slide.querySelector('video');
     if (video) {
-      // Handle autoplay policy - restart if paused by browser
+      if (videoObserver && video.hasAttribute('data-autoplay')) {
+        videoObserver.observe(video);
+      } else {
+        visibleVideos.add(video);
+        playVideo(video);
+      }
+
+      // Handle autoplay policy - restart if paused by browser while on screen
       video.addEventListener('pause', () => {
         // Don't restart if user manually paused
-        if (video.readyState >= 2) {
-          video.play().catch(e => console.log('Autoplay prevented:', e));
+        if (visibleVideos.has(video) && video.readyState >= 2) {
+          playVideo(video);
         }
       });
 
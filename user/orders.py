@@ -0,0 +1,59 @@
+# user/orders.py
+from decimal import Decimal
+
+from django.db import transaction
+
+from .models import Order, OrderItem
+
+# Checkout extras: session key (see update_cart_addons) -> (item title, price)
+ADDONS = {
+    "Bag": ("Bag", Decimal('30')),
+    "bookmark": ("Bookmark", Decimal('20')),
+    "packing": ("Packing", Decimal('20')),
+}
+
+
+def place_order(validated_cart, addons, totals, payment_method, status, **customer):
+    """
+    Create an Order for a validated cart (see validate_cart_against_db) in one
+    transaction: the order row, then every cart line and selected addon in a
+    single bulk insert. `customer` holds the contact and shipping fields.
+
+    Returns (order, items); pass `items` on instead of re-reading order.items.
+    """
+    with transaction.atomic():
+        order = Order.objects.create(
+            payment_method=payment_method,
+            subtotal=totals['subtotal'],
+            shipping=totals['shipping'],
+            discount=totals['discount'],
+            total=totals['total'],
+            status=status,
+            **customer,
+        )
+        items = [
+            OrderItem(
+                order=order,
+                item_type=item['type'],
+                item_id=item['id'],
+                title=item['title'],
+                price=Decimal(str(item['price'])),
+                quantity=item['quantity'],
+                image_url=item.get('image', ''),
+            )
+            for item in validated_cart.values()
+        ]
+        items += [
+            OrderItem(
+                order=order,
+                item_type="addon",
+                item_id=0,
+                title=ADDONS[addon_key][0],
+                price=ADDONS[addon_key][1],
+                quantity=1,
+                image_url="",
+            )
+            for addon_key, selected in addons.items() if selected and addon_key in ADDONS
+        ]
+        OrderItem.objects.bulk_create(items)
+    return order, items
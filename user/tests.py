@@ -1,19 +1,132 @@
-import requests
-import json
+from decimal import Decimal
 
-BASE_URL = "https://apiv2.shiprocket.in/v1/external"
+from django.test import TestCase
+from django.urls import reverse
 
-EMAIL = "aritrada420@gmail.com"
-PASSWORD = "U12u!BK7PQoHo3%bjliA*gqbEllfp!KU"
+from homepage.models import Book
+from product_categories.models import Product, product_variety
 
-login_url = f"{BASE_URL}/auth/login"
-payload = {"email": EMAIL, "password": PASSWORD}
+from .models import Order, OrderItem
+from .orders import place_order
+from .views import validate_cart_against_db
 
-resp = requests.post(login_url, json=payload, timeout=15)
-print("Status:", resp.status_code)
-print("Body:", resp.text)
+CUSTOMER = {
+    'email': 'reader@example.com',
+    'phone_number': '9999999999',
+    'full_name': 'A Reader',
+    'address': '1 Library Road',
+    'city': 'Kolkata',
+    'state': 'West Bengal',
+    'pin_code': '700001',
+}
 
-if resp.ok:
-    data = resp.json()
-    token = data.get("token")
-    print("Token:", token)
\ No newline at end of file
+
+class ValidateCartTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.book = Book.objects.create(title="Godan", category='hindi', price=Decimal('250.00'))
+        variety = product_variety.objects.create(name="Bookmarks", type='NEW', image='product_categories/x.jpg')
+        cls.product = Product.objects.create(category=variety, title="Bookmark", price=Decimal('40.00'))
+
+    def test_uses_database_prices(self):
+        cart = {
+            'b': {'type': 'book', 'id': self.book.id, 'quantity': 2, 'price': 1, 'title': "Godan"},
+            'p': {'type': 'product', 'id': str(self.product.id), 'quantity': '3'},
+        }
+        validated, subtotal = validate_cart_against_db(cart)
+        self.assertEqual(subtotal, Decimal('620.00'))
+        self.assertEqual(validated['b']['price'], 250.0)
+        self.assertEqual(validated['p']['quantity'], 3)
+        self.assertEqual(validated['p']['title'], "Bookmark")
+
+    def test_one_query_per_item_type(self):
+        other = Book.objects.create(title="Nirmala", category='hindi', price=Decimal('199.00'))
+        cart = {
+            'b1': {'type': 'book', 'id': self.book.id},
+            'b2': {'type': 'book', 'id': other.id},
+            'p': {'type': 'product', 'id': self.product.id},
+        }
+        with self.assertNumQueries(2):
+            validated, _ = validate_cart_against_db(cart)
+        self.assertEqual(len(validated), 3)
+
+    def test_reports_missing_items_by_id(self):
+        cart = {
+            'b': {'type': 'book', 'id': self.book.id},
+            'x': {'type': 'book', 'id': 987654, 'title': "<script>alert(1)</script>"},
+            'y': {'type': 'product', 'id': 876543},
+        }
+        validated, error = validate_cart_against_db(cart)
+        self.assertIsNone(validated)
+        self.assertEqual(error, "Some items in your cart are no longer available: book #987654, product #876543")
+
+    def test_rejects_malformed_items(self):
+        for item in (
+            {'type': 'book'},
+            {'type': 'book', 'id': None},
+            {'type': 'book', 'id': '12abc'},
+            {'type': 'book', 'id': True},
+            {'type': 'book', 'id': -1},
+            {'type': 'ebook', 'id': self.book.id},
+        ):
+            with self.subTest(item=item):
+                self.assertEqual(validate_cart_against_db({'k': item}), (None, "Some items in your cart are invalid"))
+
+    def test_rejects_bad_quantities(self):
+        for quantity in (0, -2, 'two', None):
+            with self.subTest(quantity=quantity):
+                cart = {'k': {'type': 'book', 'id': self.book.id, 'quantity': quantity}}
+                self.assertEqual(validate_cart_against_db(cart), (None, "Invalid quantity"))
+
+    def test_hides_unexpected_errors(self):
+        with self.assertLogs('user.views', level='ERROR'):
+            self.assertEqual(validate_cart_against_db({'k': 'not an item'}), (None, "Could not validate your cart"))
+
+    def test_empty_cart(self):
+        self.assertEqual(validate_cart_against_db({}), (None, "Cart is empty"))
+
+
+class PlaceOrderTests(TestCase):
+    cart = {
+        'b': {'id': 7, 'type': 'book', 'title': "Godan", 'price': 250.0, 'image': '', 'quantity': 2},
+    }
+    totals = {
+        'subtotal': Decimal('500'), 'shipping': Decimal('0'), 'discount': Decimal('0'), 'total': Decimal('530'),
+    }
+
+    def test_creates_order_with_items_and_addons(self):
+        addons = {'Bag': True, 'bookmark': False, 'gift': True}
+        order, items = place_order(self.cart, addons, self.totals, 'cod', 'processing', **CUSTOMER)
+        self.assertEqual(order.total, Decimal('530'))
+        self.assertEqual(order.full_name, CUSTOMER['full_name'])
+        stored = list(order.items.order_by('id').values_list('item_type', 'item_id', 'title', 'price', 'quantity'))
+        self.assertEqual(stored, [
+            ('book', 7, "Godan", Decimal('250.00'), 2),
+            ('addon', 0, "Bag", Decimal('30.00'), 1),
+        ])
+        self.assertEqual(len(items), 2)
+
+    def test_rolls_back_on_failure(self):
+        broken = {**self.cart, 'x': {'id': 8, 'type': 'book', 'price': 10.0, 'quantity': 1}}
+        with self.assertRaises(KeyError):
+            place_order(broken, {}, self.totals, 'cod', 'processing', **CUSTOMER)
+        self.assertFalse(Order.objects.exists())
+        self.assertFalse(OrderItem.objects.exists())
+
+
+class CacheControlTests(TestCase):
+    def assertPrivate(self, response):
+        for directive in ('private', 'no-store', 'no-cache', 'max-age=0'):
+            self.assertIn(directive, response['Cache-Control'])
+        self.assertEqual(response['Pragma'], 'no-cache')
+        self.assertEqual(response['Expires'], '0')
+
+    def test_cart_and_order_routes_are_private(self):
+        order = Order.objects.create(**CUSTOMER)
+        for url in (
+            reverse('get_cart_items'),
+            reverse('shiprocket_product_status'),
+            reverse('shiprocket_order_details', args=[order.id]),
+        ):
+            with self.subTest(url=url):
+                self.assertPrivate(self.client.get(url))
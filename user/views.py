@@ -9,13 +9,14 @@ from django.core.cache import cache
 from django.db import transaction, IntegrityError
 from django.http import HttpResponse, JsonResponse
 from django.shortcuts import get_object_or_404, render, redirect
-from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.csrf import csrf_exempt, ensure_csrf_cookie
 from django.views.decorators.http import require_GET, require_POST
 from homepage.models import Book
 from product_categories.models import Product
 import requests
 
-from .models import Order, OrderItem
+from .models import Order
+from .orders import ADDONS, place_order
 from .payu_utils import generate_payu_hash, generate_transaction_id, verify_payu_hash
 from .shiprocket_utils import ShiprocketAPI
 from .utils import send_admin_order_notification, send_customer_order_confirmation
@@ -37,10 +38,28 @@ def validate_pincode(pincode):
     """Validate 6-digit pincode"""
     return len(pincode) == 6 and pincode.isdigit()
 
+# Cart item type -> model, and the columns validation reads
+CART_ITEM_MODELS = {'book': Book, 'product': Product}
+CART_ITEM_FIELDS = ('id', 'title', 'price', 'image')
+
+def _positive_int(value):
+    """`value` as an int if it is a whole number >= 1 (int or digit string), else None"""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, str) and value.strip().isdigit():
+        value = int(value)
+    if isinstance(value, int) and value >= 1:
+        return value
+    return None
+
 def validate_cart_against_db(cart):
     """
     Validate cart items exist in DB and return validated cart with DB prices
     CRITICAL: Prevents price tampering
+
+    Items are loaded with one query per item type, whatever the cart size,
+    and every missing item is reported at once, by type and id: the cart's
+    titles come from the client and are never echoed back.
     """
     if not cart:
         return None, "Cart is empty"
@@ -49,23 +68,36 @@ def validate_cart_against_db(cart):
     subtotal = Decimal('0.00')
     
     try:
+        lines = []
+        ids_by_type = {}
         for key, item in cart.items():
             item_type = item.get('type')
-            item_id = item.get('id')
-            quantity = int(item.get('quantity', 1))
+            item_id = _positive_int(item.get('id'))
+            quantity = _positive_int(item.get('quantity', 1))
             
-            if quantity < 1:
-                raise ValueError("Invalid quantity")
+            if quantity is None:
+                return None, "Invalid quantity"
+            if item_type not in CART_ITEM_MODELS or item_id is None:
+                return None, "Some items in your cart are invalid"
             
-            # Fetch actual object from DB
-            if item_type == 'book':
-                obj = Book.objects.get(id=item_id)
-                item_price = obj.price
-            elif item_type == 'product':
-                obj = Product.objects.get(id=item_id)
-                item_price = obj.price
-            else:
-                raise ValueError(f"Unknown item type: {item_type}")
+            lines.append((key, item_type, item_id, quantity))
+            ids_by_type.setdefault(item_type, set()).add(item_id)
+        
+        # Fetch actual objects from DB
+        found = {
+            item_type: CART_ITEM_MODELS[item_type].objects.only(*CART_ITEM_FIELDS).in_bulk(ids)
+            for item_type, ids in ids_by_type.items()
+        }
+        missing = [
+            f"{item_type} #{item_id}"
+            for _, item_type, item_id, _ in lines if item_id not in found[item_type]
+        ]
+        if missing:
+            return None, f"Some items in your cart are no longer available: {', '.join(missing)}"
+        
+        for key, item_type, item_id, quantity in lines:
+            obj = found[item_type][item_id]
+            item_price = obj.price
             
             # TODO: Add stock validation when stock field is added to models
             # if hasattr(obj, 'stock') and obj.stock < quantity:
@@ -83,18 +115,15 @@ def validate_cart_against_db(cart):
         
         return validated_cart, subtotal
         
-    except (Book.DoesNotExist, Product.DoesNotExist):
-        return None, "Some items in your cart are no longer available"
     except Exception as e:
-        logger.error(f"Cart validation error: {str(e)}")
-        return None, str(e)
+        logger.error(f"Cart validation error: {str(e)}", exc_info=True)
+        return None, "Could not validate your cart"
 
 def calculate_order_totals(validated_cart, addons, payment_method):
     """Calculate totals server-side using validated data"""
     subtotal = sum(Decimal(str(item['price'])) * item['quantity'] for item in validated_cart.values())
     
-    addon_prices = {"Bag": Decimal('30'), "bookmark": Decimal('20'), "packing": Decimal('20')}
-    addon_total = sum(addon_prices.get(key, Decimal('0')) for key, selected in addons.items() if selected)
+    addon_total = sum(ADDONS[key][1] for key, selected in addons.items() if selected and key in ADDONS)
     
     total_books = sum(item['quantity'] for item in validated_cart.values())
     
@@ -227,8 +256,12 @@ def get_cart_addons(request):
     addon_total = sum(addon_prices.get(key, 0) for key, selected in addons.items() if selected)
     return JsonResponse({"addons": addons, "addon_total": addon_total})
 
+@ensure_csrf_cookie
 def get_cart_items(request):
-    """Get cart items for display"""
+    """
+    Get cart items for display. Every page fetches this on load, so it also
+    hands out the CSRF cookie the publicly cached pages no longer embed.
+    """
     cart = get_cart(request)
     addons = request.session.get("cart_addons", {})
     
@@ -421,8 +454,11 @@ def initiate_payu_payment(request):
         # Use validated data for calculations
         totals = calculate_order_totals(validated_cart, addons, 'payu')
         
-        # Create order
-        order = Order.objects.create(
+        # Create order and its items in one transaction
+        order, _ = place_order(
+            validated_cart, addons, totals,
+            payment_method='payu',
+            status="pending_payment",
             email=email,
             phone_number=phone,
             full_name=data.get('fullname', '').strip(),
@@ -431,41 +467,8 @@ def initiate_payu_payment(request):
             state=data.get('state', '').strip(),
             pin_code=pincode,
             delivery_type=data.get('delivery', 'Standard (3-6 days)'),
-            payment_method='payu',
-            subtotal=totals['subtotal'],
-            shipping=totals['shipping'],
-            discount=totals['discount'],
-            total=totals['total'],
-            status="pending_payment",
         )
         
-        # Create order items
-        for item in validated_cart.values():
-            OrderItem.objects.create(
-                order=order,
-                item_type=item['type'],
-                item_id=item['id'],
-                title=item['title'],
-                price=Decimal(str(item['price'])),
-                quantity=item['quantity'],
-                image_url=item.get('image', ''),
-            )
-        
-        # Add addons
-        addon_names = {"Bag": "Bag", "bookmark": "Bookmark", "packing": "Packing"}
-        addon_prices = {"Bag": Decimal('30'), "bookmark": Decimal('20'), "packing": Decimal('20')}
-        for addon_key, selected in addons.items():
-            if selected and addon_key in addon_names:
-                OrderItem.objects.create(
-                    order=order,
-                    item_type="addon",
-                    item_id=0,
-                    title=addon_names[addon_key],
-                    price=addon_prices[addon_key],
-                    quantity=1,
-                    image_url="",
-                )
-        
         # Generate unique transaction ID
         txnid = generate_transaction_id()
         
@@ -541,8 +544,11 @@ def place_cod_order(request):
         
         totals = calculate_order_totals(validated_cart, addons, 'cod')
         
-        # Create order
-        order = Order.objects.create(
+        # Create order and its items in one transaction
+        order, items = place_order(
+            validated_cart, addons, totals,
+            payment_method='cod',
+            status="processing",
             email=data.get('email', '').strip(),
             phone_number=phone,
             full_name=data.get('fullname', '').strip(),
@@ -551,45 +557,12 @@ def place_cod_order(request):
             state=data.get('state', '').strip(),
             pin_code=pincode,
             delivery_type=data.get('delivery', 'Standard (3-6 days)'),
-            payment_method='cod',
-            subtotal=totals['subtotal'],
-            shipping=totals['shipping'],
-            discount=totals['discount'],
-            total=totals['total'],
-            status="processing",
         )
         
-        # Create order items
-        for item in validated_cart.values():
-            OrderItem.objects.create(
-                order=order,
-                item_type=item['type'],
-                item_id=item['id'],
-                title=item['title'],
-                price=Decimal(str(item['price'])),
-                quantity=item['quantity'],
-                image_url=item.get('image', ''),
-            )
-        
-        # Add addons
-        addon_names = {"Bag": "Bag", "bookmark": "Bookmark", "packing": "Packing"}
-        addon_prices = {"Bag": Decimal('30'), "bookmark": Decimal('20'), "packing": Decimal('20')}
-        for addon_key, selected in addons.items():
-            if selected and addon_key in addon_names:
-                OrderItem.objects.create(
-                    order=order,
-                    item_type="addon",
-                    item_id=0,
-                    title=addon_names[addon_key],
-                    price=addon_prices[addon_key],
-                    quantity=1,
-                    image_url="",
-                )
-        
         # Create Shiprocket shipment
         try:
             shiprocket = ShiprocketAPI()
-            shiprocket_success, shiprocket_result = shiprocket.create_order(order, order.items.all())
+            shiprocket_success, shiprocket_result = shiprocket.create_order(order, items)
             if shiprocket_success:
                 order.shiprocket_order_id = shiprocket_result.get("order_id")
                 order.awb_number = shiprocket_result.get("awb_code", "")
@@ -602,8 +575,8 @@ def place_cod_order(request):
             # Don't fail the order, allow manual processing
         
         # Send notifications
-        send_admin_order_notification(order, order.items.all())
-        send_customer_order_confirmation(order, order.items.all())
+        send_admin_order_notification(order, items)
+        send_customer_order_confirmation(order, items)
         order.customer_notified = True
         order.save()
         